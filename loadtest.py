@@ -0,0 +1,362 @@
+"""
+NEXUS load-testing harness.
+
+Starts a stub upstream (RSS + Open-Meteo, optionally a WebSub hub), boots
+streamlit-app.py against it with NEXUS_UPSTREAM_OVERRIDE, then drives N concurrent headless sessions over
+the same websocket protocol the browser uses. Each level reports rerun latency
+percentiles, server CPU and memory per session, and the level at which the
+server saturates.
+
+Usage:
+    python loadtest.py --sessions 1,2,4,8,16,32 --reruns 5
+    python loadtest.py --sessions 1,4,16 --json results.json
+    python loadtest.py --websub --push-interval 2    # feeds pushed by a stand-in hub
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import hashlib
+import hmac
+import secrets
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+from urllib.request import Request, urlopen
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit-app.py")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# ============================================================================
+# STUB UPSTREAM
+# ============================================================================
+
+STUB_HUB = "hub.stub"
+
+def _stub_item(host, i, age):
+    return f"""<item>
+            <title>{host} headline {i}: markets, climate and elections</title>
+            <link>https://{host}/story/{i}</link>
+            <description>&lt;p&gt;Stub summary {i} for load testing the dashboard.&lt;/p&gt;</description>
+            <pubDate>{time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() - age))}</pubDate>
+        </item>"""
+
+
+def _stub_rss(host, items, path="", hub=False):
+    links = (
+        f'<atom:link rel="hub" href="https://{STUB_HUB}/"/><atom:link rel="self" href="https://{host}{path}"/>'
+        if hub else ""
+    )
+    entries = "".join(_stub_item(host, i, i * 60) for i in range(items))
+    return f"""<?xml version="1.0"?>
+    <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel><title>{host}</title>{links}{entries}</channel></rss>"""
+
+
+def _stub_forecast():
+    hours = [f"2026-10-19T{h:02d}:00" for h in range(24)]
+    return json.dumps({
+        "current_weather": {"temperature": 18.5, "windspeed": 11.2, "weathercode": 2},
+        "hourly": {
+            "time": hours,
+            "temperature_2m": [15 + h % 8 for h in range(24)],
+            "precipitation_probability": [h * 3 % 100 for h in range(24)],
+        },
+    })
+
+
+class StubHub:
+    """Stand-in WebSub hub: verifies intent, then pushes one new item per interval"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+        threading.Thread(target=self._push_forever, daemon=True).start()
+
+    def subscribe(self, form):
+        threading.Thread(target=self._verify, args=(form,), daemon=True).start()
+
+    def _verify(self, form):
+        challenge = secrets.token_hex(8)
+        query = urlencode({
+            "hub.mode": form["hub.mode"],
+            "hub.topic": form["hub.topic"],
+            "hub.challenge": challenge,
+            "hub.lease_seconds": form.get("hub.lease_seconds", "3600"),
+        })
+        try:
+            with urlopen(f"{form['hub.callback']}?{query}", timeout=5) as resp:
+                if resp.read().decode() != challenge:
+                    return
+        except OSError:
+            return
+        with self.lock:
+            self.subscriptions[form["hub.callback"]] = {
+                "topic": form["hub.topic"], "secret": form.get("hub.secret", ""), "pushed": 0,
+            }
+
+    def _push_forever(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                targets = list(self.subscriptions.items())
+            for callback, sub in targets:
+                host = sub["topic"].split("/")[2]
+                sub["pushed"] += 1
+                body = f"""<?xml version="1.0"?>
+    <rss version="2.0"><channel><title>{host}</title>{_stub_item(host, f"push-{sub['pushed']}", 0)}</channel></rss>""".encode()
+                signature = hmac.new(sub["secret"].encode(), body, hashlib.sha256).hexdigest()
+                request = Request(callback, data=body, headers={
+                    "Content-Type": "application/rss+xml", "X-Hub-Signature": f"sha256={signature}",
+                })
+                try:
+                    urlopen(request, timeout=5).close()
+                except OSError:
+                    pass
+
+
+def start_stub_upstream(items, delay, hub=None):
+    """Serve canned feeds and forecasts (and optionally a hub) on an ephemeral port"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            host = self.path.lstrip("/").split("/", 1)[0]
+            form = dict(parse_qsl(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()))
+            if hub is None or host != STUB_HUB or form.get("hub.mode") != "subscribe":
+                self.send_response(400)
+            else:
+                hub.subscribe(form)
+                self.send_response(202)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            host, _, path = self.path.lstrip("/").partition("/")
+            if host == "api.open-meteo.com":
+                body, ctype = _stub_forecast(), "application/json"
+            else:
+                body, ctype = _stub_rss(host, items, f"/{path}", hub is not None), "application/rss+xml"
+            payload = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ============================================================================
+# SERVER PROCESS
+# ============================================================================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(port, upstream, websub_port=None):
+    env = dict(os.environ, NEXUS_UPSTREAM_OVERRIDE=upstream)
+    if websub_port:
+        env.update(NEXUS_WEBSUB_CALLBACK=f"http://127.0.0.1:{websub_port}", NEXUS_WEBSUB_PORT=str(websub_port))
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", APP_PATH,
+        "--server.headless=true",
+        f"--server.port={port}",
+        "--server.fileWatcherType=none",
+        "--browser.gatherUsageStats=false",
+    ]
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("streamlit exited during startup")
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+def process_usage(pid):
+    """Return (cpu_seconds, rss_bytes) for a process, or (None, None) off Linux"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        with open(f"/proc/{pid}/status") as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+        return cpu, rss
+    except (OSError, StopIteration, IndexError, ValueError):
+        return None, None
+
+# ============================================================================
+# SESSION DRIVER
+# ============================================================================
+
+async def run_session(url, reruns, warmup, latencies, errors):
+    from websockets.asyncio.client import connect
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    try:
+        async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            for i in range(warmup + reruns):
+                msg = BackMsg()
+                msg.rerun_script.query_string = ""
+                started = time.perf_counter()
+                await ws.send(msg.SerializeToString())
+                failure = None
+                while True:
+                    fwd = ForwardMsg()
+                    fwd.ParseFromString(await ws.recv())
+                    kind = fwd.WhichOneof("type")
+                    if kind == "script_finished":
+                        break
+                    # A rerun that raises still finishes; st.exception elements give it away
+                    if (kind == "delta" and fwd.delta.WhichOneof("type") == "new_element"
+                            and fwd.delta.new_element.WhichOneof("type") == "exception"):
+                        exc = fwd.delta.new_element.exception
+                        failure = failure or f"{exc.type}: {exc.message}"
+                if i < warmup:
+                    continue
+                if failure:
+                    errors.append(failure)
+                else:
+                    latencies.append(time.perf_counter() - started)
+    except Exception as e:
+        errors.append(repr(e))
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_level(url, pid, sessions, reruns, warmup):
+    latencies, errors = [], []
+    cpu_before, rss_before = process_usage(pid)
+    started = time.perf_counter()
+
+    async def drive():
+        await asyncio.gather(*(run_session(url, reruns, warmup, latencies, errors) for _ in range(sessions)))
+
+    asyncio.run(drive())
+    wall = time.perf_counter() - started
+    cpu_after, rss_after = process_usage(pid)
+
+    result = {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": len(errors),
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=float("nan")) * 1000,
+    }
+    if cpu_before is not None and cpu_after is not None:
+        cpu = cpu_after - cpu_before
+        result.update({
+            "cpu_pct": cpu / wall * 100 if wall else 0.0,
+            "cpu_s_per_session": cpu / sessions,
+            "rss_mb": rss_after / 2**20,
+            "rss_delta_mb_per_session": (rss_after - rss_before) / 2**20 / sessions,
+        })
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def find_saturation(results, slo_ms, min_gain):
+    """First level where throughput stops scaling or p95 breaks the SLO"""
+    for i, cur in enumerate(results):
+        # Every level, the first included, is held to the SLO and must run clean
+        if cur["errors"] or cur["p95_ms"] > slo_ms:
+            return cur["sessions"], f"p95 {cur['p95_ms']:.0f}ms over {slo_ms:.0f}ms SLO" if not cur["errors"] else "session errors"
+        prev = results[i - 1] if i else None
+        if prev and cur["throughput_rps"] < prev["throughput_rps"] * (1 + min_gain):
+            return cur["sessions"], f"throughput flat ({prev['throughput_rps']:.1f} -> {cur['throughput_rps']:.1f} reruns/s)"
+    return None, "not reached"
+
+
+def print_table(results):
+    header = f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu %':>7} {'cpu s/sess':>10} {'rss MB':>8} {'ΔMB/sess':>9} {'err':>4}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['sessions']:>8} {r['throughput_rps']:>9.2f} {r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} {r['p99_ms']:>8.0f} "
+            f"{r.get('cpu_pct', float('nan')):>7.0f} {r.get('cpu_s_per_session', float('nan')):>10.3f} "
+            f"{r.get('rss_mb', float('nan')):>8.0f} {r.get('rss_delta_mb_per_session', float('nan')):>9.2f} {r['errors']:>4}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for streamlit-app.py")
+    parser.add_argument("--sessions", default="1,2,4,8,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--reruns", type=int, default=5, help="measured reruns per session")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured reruns per session (first page load)")
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 rerun latency considered saturated")
+    parser.add_argument("--min-gain", type=float, default=0.10, help="throughput gain below which a level counts as flat")
+    parser.add_argument("--feed-items", type=int, default=20, help="items per stub RSS feed")
+    parser.add_argument("--upstream-delay", type=float, default=0.0, help="seconds of latency added to each stub response")
+    parser.add_argument("--port", type=int, default=0, help="port for the app server (default: ephemeral)")
+    parser.add_argument("--websub", action="store_true", help="advertise a stand-in WebSub hub that pushes to the app")
+    parser.add_argument("--push-interval", type=float, default=5.0, help="seconds between stand-in hub pushes")
+    parser.add_argument("--json", help="write raw results to this file")
+    args = parser.parse_args()
+
+    levels = [int(n) for n in args.sessions.split(",") if n.strip()]
+    hub = StubHub(args.push_interval) if args.websub else None
+    stub = start_stub_upstream(args.feed_items, args.upstream_delay, hub)
+    upstream = f"http://127.0.0.1:{stub.server_address[1]}"
+    port = args.port or _free_port()
+
+    print(f"Starting app on :{port} with stub upstream {upstream}")
+    proc = start_app(port, upstream, _free_port() if args.websub else None)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    results = []
+    try:
+        # Prime imports and upstream caches so level one does not measure cold start
+        run_level(url, proc.pid, 1, 0, 1)
+        for sessions in levels:
+            result = run_level(url, proc.pid, sessions, args.reruns, args.warmup)
+            results.append(result)
+            print(f"  {sessions:>4} sessions: p95 {result['p95_ms']:.0f}ms, {result['throughput_rps']:.2f} reruns/s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        stub.shutdown()
+
+    print()
+    print_table(results)
+    level, reason = find_saturation(results, args.slo_ms, args.min_gain)
+    print()
+    print(f"Saturation point: {level if level is not None else '-'} sessions ({reason})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"levels": results, "saturation": {"sessions": level, "reason": reason}}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
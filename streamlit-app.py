@@ -1,14 +1,43 @@
+import time
+_script_started = time.perf_counter()
+
 import streamlit as st
-import feedparser
-import requests
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from datetime import datetime
 import random
-import time
 import json
-from collections import defaultdict
+import io
+import os
+import sys
+import argparse
+import importlib
+import html
+import csv
+import math
+import calendar
+import re
+import heapq
+import itertools
+import functools
+import hashlib
+import hmac
+import gzip
+import inspect
+import pickle
+import zlib
+import secrets
+import socket
+import ipaddress
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque, OrderedDict, namedtuple
+from urllib.parse import urlsplit, urljoin, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html.parser import HTMLParser
+
+# feedparser, requests and plotly are imported on first use via lazy_import()
+_eager_imports_s = time.perf_counter() - _script_started
 
 # ============================================================================
 # CONFIGURATION & PAGE SETUP
@@ -20,6 +49,202 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ============================================================================
+# STARTUP PROFILING
+# ============================================================================
+
+# NEXUS_STARTUP_PROFILE=1 reports import cost per module and time to first paint
+STARTUP_PROFILE = os.environ.get("NEXUS_STARTUP_PROFILE") == "1"
+
+@st.cache_resource
+def get_startup_timings():
+    """Import and first-paint timings for this process"""
+    return {"imports": {}, "eager_imports_s": _eager_imports_s, "first_paint_s": None, "last_run_s": None}
+
+def lazy_import(name):
+    """Import a module on first use, recording how long the first import took"""
+    first_use = name not in sys.modules
+    started = time.perf_counter()
+    # Not sys.modules directly: it holds half-initialized modules while another
+    # thread is importing them, and import_module waits for those to finish
+    module = importlib.import_module(name)
+    if first_use:
+        get_startup_timings()["imports"][name] = time.perf_counter() - started
+    return module
+
+def report_startup(elapsed):
+    """Record this run's duration and show the import breakdown"""
+    timings = get_startup_timings()
+    timings["last_run_s"] = elapsed
+    if timings["first_paint_s"] is None:
+        timings["first_paint_s"] = elapsed
+        lines = [f"[nexus] first paint {elapsed * 1000:.0f} ms, eager imports {timings['eager_imports_s'] * 1000:.0f} ms"]
+        lines += [f"[nexus]   import {name}: {cost * 1000:.0f} ms" for name, cost in timings["imports"].items()]
+        print("\n".join(lines), file=sys.stderr)
+    
+    with st.sidebar.expander("⏱️ Startup Profile"):
+        rows = [("eager imports", timings["eager_imports_s"])] + sorted(
+            timings["imports"].items(), key=lambda item: item[1], reverse=True
+        )
+        st.markdown(
+            "\n".join(f"- `{name}` {cost * 1000:.0f} ms" for name, cost in rows)
+            + f"\n\nFirst paint: **{timings['first_paint_s'] * 1000:.0f} ms** • "
+            f"This run: **{elapsed * 1000:.0f} ms**"
+        )
+
+# ============================================================================
+# RERUN PROFILER
+# ============================================================================
+
+# NEXUS_OPERATOR=1 exposes the sidebar "Profile this rerun" button
+OPERATOR_MODE = os.environ.get("NEXUS_OPERATOR") == "1"
+PROFILE_DIR = os.environ.get("NEXUS_PROFILE_DIR", "profiles")
+PROFILE_INTERVAL = 0.001
+PROFILE_TOP_N = 15
+
+class StackSampler:
+    """Wall-clock sampling profiler for a thread and the workers it hands off to
+
+    A daemon thread snapshots the target thread's stack every `interval`
+    seconds, so I/O waits (cache misses, upstream fetches) show up alongside
+    CPU work. Threads matching `include` are sampled too, but only while they
+    are running this app's code, so idle pool workers add nothing. Each stack
+    is rooted at a frame naming its thread. Nothing is installed in the
+    profiled threads themselves.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL, include=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.include = include
+        self.frames = {}
+        self.samples = []
+        self.weights = []
+        self.sample_threads = []    # thread name per sample
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _frame_index(self, key):
+        if key not in self.frames:
+            self.frames[key] = len(self.frames)
+        return self.frames[key]
+
+    def _stack(self, frame, thread_name):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(self._frame_index((code.co_name, code.co_filename, code.co_firstlineno)))
+            frame = frame.f_back
+        stack.append(self._frame_index((f"thread {thread_name}", "", 0)))
+        stack.reverse()
+        return stack
+
+    def _run(self):
+        app_file = self._run.__code__.co_filename
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            weight, last = (now - last) * 1000, now
+            threads = [(self.thread_id, "script")]
+            if self.include:
+                threads += [(t.ident, t.name) for t in threading.enumerate() if t.ident != self.thread_id and self.include(t)]
+            for ident, name in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                if ident != self.thread_id:
+                    walk = frame
+                    while walk is not None and walk.f_code.co_filename != app_file:
+                        walk = walk.f_back
+                    if walk is None:
+                        continue
+                self.samples.append(self._stack(frame, name))
+                self.weights.append(weight)
+                self.sample_threads.append(name)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def hot_functions(self, n=PROFILE_TOP_N):
+        """Return [(name, self_ms, total_ms)] ordered by self time"""
+        names = {index: key for key, index in self.frames.items()}
+        self_ms, total_ms = defaultdict(float), defaultdict(float)
+        for stack, weight in zip(self.samples, self.weights):
+            self_ms[stack[-1]] += weight
+            for index in set(stack):
+                total_ms[index] += weight
+        ranked = sorted(self_ms, key=self_ms.get, reverse=True)[:n]
+        return [
+            (f"{names[i][0]} ({os.path.basename(names[i][1])}:{names[i][2]})", self_ms[i], total_ms[i])
+            for i in ranked
+        ]
+
+    def speedscope(self, name):
+        """Profile in speedscope's sampled file format, one profile per thread"""
+        frames = [None] * len(self.frames)
+        for (func, filename, line), index in self.frames.items():
+            frames[index] = {"name": func, "file": filename, "line": line}
+        by_thread = defaultdict(lambda: ([], []))
+        for stack, weight, thread in zip(self.samples, self.weights, self.sample_threads):
+            by_thread[thread][0].append(stack)
+            by_thread[thread][1].append(weight)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{name} [{thread}]",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            } for thread, (samples, weights) in by_thread.items()],
+            "name": name,
+            "exporter": "nexus-stack-sampler",
+        }
+
+    def folded(self):
+        """Profile as folded stacks for flamegraph.pl / inferno"""
+        names = {index: key[0] for key, index in self.frames.items()}
+        counts = defaultdict(float)
+        for stack, weight in zip(self.samples, self.weights):
+            counts[";".join(names[i] for i in stack)] += weight
+        return "".join(f"{stack} {max(1, round(ms * 1000))}\n" for stack, ms in counts.items())
+
+def profile_run(func):
+    """Run `func` under the stack sampler, save the profile and show hot spots"""
+    # Fetches run on the refresh pool, so a cache miss is more than a wait in future.result()
+    include = lambda thread: thread.name.startswith("nexus-refresh")
+    with StackSampler(threading.get_ident(), include=include) as sampler:
+        func()
+    
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    name = f"nexus-rerun-{stamp}"
+    speedscope = json.dumps(sampler.speedscope(name))
+    with open(os.path.join(PROFILE_DIR, f"{name}.speedscope.json"), "w") as f:
+        f.write(speedscope)
+    with open(os.path.join(PROFILE_DIR, f"{name}.folded"), "w") as f:
+        f.write(sampler.folded())
+    
+    with st.sidebar.expander("🔬 Rerun Profile", expanded=True):
+        st.markdown(f"**{sampler.elapsed * 1000:.0f} ms** wall • {len(sampler.samples)} samples")
+        st.markdown(
+            "| function | self ms | total ms |\n|---|---:|---:|\n"
+            + "\n".join(f"| `{fn}` | {self_ms:.1f} | {total_ms:.1f} |" for fn, self_ms, total_ms in sampler.hot_functions())
+        )
+        st.download_button("⬇️ speedscope.json", speedscope, file_name=f"{name}.speedscope.json", mime="application/json")
+        st.caption(f"Saved to {PROFILE_DIR}/{name}.speedscope.json and .folded")
+
 # ============================================================================
 # ADVANCED THEME SYSTEM
 # ============================================================================
@@ -258,6 +483,16 @@ def inject_premium_css(theme_name):
             transform: translateX(0);
         }}
         
+        .news-thumb {{
+            float: right;
+            width: 120px;
+            height: 80px;
+            object-fit: cover;
+            border-radius: 10px;
+            margin: 0 0 8px 16px;
+            border: 1px solid {t['card_border']};
+        }}
+        
         .news-source {{
             font-size: 0.7rem;
             color: {t['accent_primary']};
@@ -592,6 +827,71 @@ def inject_premium_css(theme_name):
             font-weight: 600;
         }}
         
+        .stat-delta {{
+            display: block;
+            font-size: 0.75rem;
+            font-weight: 700;
+            font-family: 'JetBrains Mono', monospace;
+            margin-top: 6px;
+        }}
+        
+        .sparkline {{
+            display: block;
+            width: 100%;
+            height: 24px;
+            margin-top: 8px;
+            opacity: 0.8;
+        }}
+        
+        /* ==================== TRENDING ==================== */
+        .trend-row {{
+            display: flex;
+            flex-wrap: wrap;
+            align-items: center;
+            gap: 8px;
+            margin-bottom: 10px;
+            position: relative;
+            z-index: 1;
+        }}
+        
+        .trend-category {{
+            font-size: 0.7rem;
+            font-weight: 700;
+            letter-spacing: 1px;
+            color: {t['text_muted']};
+            min-width: 80px;
+        }}
+        
+        .trend-chip {{
+            padding: 4px 10px;
+            border-radius: 12px;
+            font-size: 0.8rem;
+            color: {t['text_secondary']};
+            border: 1px solid {t['card_border']};
+        }}
+        
+        .news-watch {{
+            border-color: {t['warning']};
+            box-shadow: 0 0 14px rgba(0, 0, 0, 0.3), inset 3px 0 0 {t['warning']};
+        }}
+        
+        .watch-chip {{
+            display: inline-block;
+            padding: 2px 8px;
+            margin: 0 6px 8px 0;
+            border-radius: 10px;
+            font-size: 0.7rem;
+            font-weight: 600;
+            color: {t['warning']};
+            border: 1px solid {t['warning']};
+        }}
+        
+        .trend-rising {{
+            color: {t['accent_primary']};
+            border-color: {t['accent_primary']};
+            box-shadow: 0 0 10px {t['glow']};
+        }}
+        
         /* ==================== LOADING SPINNER ==================== */
         .spinner {{
             width: 50px;
@@ -629,232 +929,2556 @@ def inject_premium_css(theme_name):
 # DATA FETCHING & CACHING
 # ============================================================================
 
-@st.cache_data(ttl=300)
-def fetch_news(category="world"):
-    """Fetch news from multiple RSS feeds"""
-    feeds = {
-        "world": [
-            "https://feeds.reuters.com/Reuters/worldNews",
-            "https://feeds.bbci.co.uk/news/world/rss.xml",
-            "https://rss.apnews.com/AP-Top-News"
-        ],
-        "tech": [
-            "https://feeds.feedburner.com/TechCrunch/",
-            "https://www.theverge.com/rss/index.xml",
-            "https://hnrss.org/frontpage"
-        ],
-        "science": [
-            "https://www.sciencedaily.com/rss/top/science.xml",
-            "https://rss.nytimes.com/services/xml/rss/nyt/Science.xml"
-        ],
-        "business": [
-            "https://feeds.reuters.com/reuters/businessNews",
-            "https://feeds.bbci.co.uk/news/business/rss.xml"
-        ]
-    }
-    
-    articles = []
-    selected_feeds = feeds.get(category, feeds["world"])
-    
-    for url in selected_feeds:
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:4]:
-                articles.append({
-                    "title": entry.title,
-                    "link": entry.link,
-                    "published": entry.get("published", "Just now"),
-                    "source": feed.feed.get("title", "Unknown Source"),
-                    "summary": entry.get("summary", entry.get("description", ""))[:200] + "...",
-                    "category": category
-                })
-        except Exception as e:
-            continue
-    
-    random.shuffle(articles)
-    return articles[:12]
+# Point every upstream (RSS hosts, Open-Meteo) at a single base URL, e.g. the
+# stub server started by loadtest.py. The original host becomes the first path
+# segment so one stub can tell the feeds apart.
+UPSTREAM_OVERRIDE = os.environ.get("NEXUS_UPSTREAM_OVERRIDE", "").rstrip("/")
 
-@st.cache_data(ttl=900)
-def fetch_weather(lat, lon, city_name):
-    """Fetch weather data from Open-Meteo API"""
+def upstream_url(url):
+    """Rewrite an upstream URL when NEXUS_UPSTREAM_OVERRIDE is set"""
+    if not UPSTREAM_OVERRIDE:
+        return url
+    parts = urlsplit(url)
+    rewritten = f"{UPSTREAM_OVERRIDE}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+# URLs taken from visitors or from feed content (custom feeds, thumbnails, hub
+# addresses) may only reach publicly routable hosts, redirects included.
+PUBLIC_MAX_REDIRECTS = 5
+UPSTREAM_MAX_BYTES = 8 * 2**20  # largest upstream body read, after decompression
+
+def public_address(url):
+    """An address to connect to for `url`, or None unless every address its host has is public"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
     try:
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true&hourly=temperature_2m,precipitation_probability&timezone=auto"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        current = data.get("current_weather", {})
-        
-        # Weather code to emoji mapping
-        wcode = current.get("weathercode", 0)
-        conditions = {
-            0: ("Clear Sky", "☀️"),
-            1: ("Mainly Clear", "🌤️"),
-            2: ("Partly Cloudy", "⛅"),
-            3: ("Overcast", "☁️"),
-            45: ("Foggy", "🌫️"),
-            48: ("Rime Fog", "🌫️"),
-            51: ("Light Drizzle", "🌦️"),
-            61: ("Rain", "🌧️"),
-            71: ("Snow", "❄️"),
-            80: ("Rain Showers", "🌧️"),
-            95: ("Thunderstorm", "⛈️"),
-        }
-        
-        for code, (desc, icon) in sorted(conditions.items(), reverse=True):
-            if wcode >= code:
-                condition_desc, condition_icon = desc, icon
-                break
-        else:
-            condition_desc, condition_icon = "Unknown", "❓"
-        
-        return {
-            "temp": current.get("temperature", "--"),
-            "speed": current.get("windspeed", "--"),
-            "icon": condition_icon,
-            "condition": condition_desc,
-            "city": city_name,
-            "hourly": data.get("hourly", {})
-        }
-    except Exception as e:
-        return {
-            "temp": "--",
-            "speed": "--",
-            "icon": "❓",
-            "condition": "Unknown",
-            "city": city_name,
-            "hourly": {}
-        }
+        infos = socket.getaddrinfo(parts.hostname, parts.port or None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError, ValueError):
+        return None
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            return None
+    return infos[0][4][0] if infos else None
 
-@st.cache_data(ttl=60)
-def generate_market_data():
-    """Generate realistic market data with trends"""
-    tickers = {
-        "S&P 500": {"base": 4500, "volatility": 0.015},
-        "NASDAQ": {"base": 14000, "volatility": 0.02},
-        "DOW": {"base": 35000, "volatility": 0.012},
-        "BTC-USD": {"base": 42000, "volatility": 0.03},
-        "ETH-USD": {"base": 2200, "volatility": 0.035},
-        "GOLD": {"base": 1950, "volatility": 0.008},
-    }
+def is_public_url(url):
+    """True if every address the URL's host resolves to is publicly routable"""
+    if UPSTREAM_OVERRIDE:
+        return True  # the request goes to the override, never to this host
+    return public_address(url) is not None
+
+def _pinned_adapter(address):
+    """requests adapter whose connections all go to `address`
+
+    Only the TCP connect is redirected; the Host header, TLS SNI and
+    certificate check still use the name from the URL.
+    """
+    connection, connectionpool = lazy_import("urllib3.connection"), lazy_import("urllib3.connectionpool")
     
-    data = {}
+    def pinned(connection_cls):
+        class Pinned(connection_cls):
+            def _new_conn(self):
+                name, self._dns_host = self._dns_host, address
+                try:
+                    return super()._new_conn()
+                finally:
+                    self._dns_host = name
+        return Pinned
     
-    for ticker, params in tickers.items():
-        base = params["base"]
-        vol = params["volatility"]
-        
-        # Generate 24-hour price history
-        prices = [base]
-        for _ in range(24):
-            change = random.uniform(-vol, vol) * base
-            prices.append(max(prices[-1] + change, base * 0.8))
-        
-        current = prices[-1]
-        change_pct = ((current - prices[0]) / prices[0]) * 100
-        
-        # Volume simulation
-        volume = random.randint(1000000, 10000000)
-        
-        data[ticker] = {
-            "history": prices,
-            "current": current,
-            "change": change_pct,
-            "volume": volume,
-            "high": max(prices),
-            "low": min(prices)
-        }
+    class PinnedAdapter(lazy_import("requests.adapters").HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": type("PinnedHTTPConnectionPool", (connectionpool.HTTPConnectionPool,),
+                             {"ConnectionCls": pinned(connection.HTTPConnection)}),
+                "https": type("PinnedHTTPSConnectionPool", (connectionpool.HTTPSConnectionPool,),
+                              {"ConnectionCls": pinned(connection.HTTPSConnection)}),
+            }
     
-    return data
+    return PinnedAdapter()
 
-def calculate_sentiment_score():
-    """Calculate a pseudo-sentiment score"""
-    # In production, this would analyze news headlines
-    return random.uniform(-1, 1)
+def upstream_session(url, public_only=False):
+    """A requests session for one request to `url`, or None if it may not be fetched
 
-def generate_world_stats():
-    """Generate interesting world statistics"""
-    return {
-        "active_conflicts": random.randint(15, 30),
-        "global_temp_anomaly": round(random.uniform(0.8, 1.5), 2),
-        "internet_users": round(5.3 + random.uniform(-0.1, 0.1), 2),
-        "co2_ppm": random.randint(415, 425),
-        "crypto_market_cap": random.randint(1500, 2500),
-    }
+    With public_only, the host is resolved once, checked, and the connection
+    pinned to the checked address, so a name that re-resolves to a private
+    address afterwards (DNS rebinding) is never reached.
+    """
+    session = lazy_import("requests").Session()
+    if not public_only or UPSTREAM_OVERRIDE:
+        return session
+    address = public_address(url)
+    if address is None:
+        session.close()
+        return None
+    session.trust_env = False       # a proxy would resolve the name again
+    adapter = _pinned_adapter(address)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class UpstreamTooLarge(Exception):
+    pass
+
+def read_capped(response, max_bytes):
+    """A streamed response's body, refusing it as soon as it passes `max_bytes`"""
+    length = response.headers.get("Content-Length", "")
+    if length.isascii() and length.isdigit() and int(length) > max_bytes:
+        raise UpstreamTooLarge(length)
+    body = bytearray()
+    for chunk in response.iter_content(64 * 1024):
+        body += chunk
+        if len(body) > max_bytes:
+            raise UpstreamTooLarge(len(body))
+    return bytes(body)
 
 # ============================================================================
-# COMPONENT RENDERERS
+# UPSTREAM RATE GOVERNOR
 # ============================================================================
 
-def render_news_card(article, theme):
-    """Render a single news card"""
-    time_ago = article['published'][:16] if len(article['published']) > 16 else article['published']
-    
-    st.markdown(f"""
-    <div class="news-card">
-        <div class="news-source">
-            <span>📡</span>
-            <span>{article['source']}</span>
-            <span class="news-time">{time_ago}</span>
-        </div>
-        <div class="news-title">
-            <a href="{article['link']}" target="_blank">{article['title']}</a>
-        </div>
-        <div class="news-summary">
-            {article['summary']}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+# Custom feeds and thumbnails reach many hosts. Past this many buckets, idle
+# ones that have refilled are dropped (a fresh bucket behaves the same), then
+# the least recently used idle ones.
+RATE_GOVERNOR_MAX_HOSTS = 512
 
-def render_weather_card(weather, theme):
-    """Render weather widget"""
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-label">CURRENT CONDITIONS</div>
-        <div style="font-size: 5rem; margin: 20px 0;">{weather['icon']}</div>
-        <div class="metric-value">{weather['temp']}°</div>
-        <div class="metric-subtitle">{weather['city']}</div>
-        <div style="color: {theme['text_secondary']}; margin-top: 12px;">
-            {weather['condition']}
-        </div>
-        <div class="metric-footer">
-            <div style="display: flex; justify-content: space-around;">
-                <div>💨 {weather['speed']} km/h</div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+# Lower value = served first. Preset locations and the default tab are HIGH.
+PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW = 0, 1, 2
 
-def render_market_card(name, data, theme):
-    """Render market ticker card with chart"""
-    color = theme['success'] if data['change'] >= 0 else theme['danger']
-    arrow = "↗" if data['change'] >= 0 else "↘"
-    
-    # Create sparkline
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        y=data['history'],
-        mode='lines',
-        line=dict(color=color, width=2.5),
-        fill='tozeroy',
-        fillcolor='rgba(74, 222, 128, 0.1)' if data['change'] >= 0 else 'rgba(248, 113, 113, 0.1)',
-        hovertemplate='$%{y:,.2f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        margin=dict(l=0, r=0, t=0, b=0),
-        height=70,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        showlegend=False
-    )
+# How long a request may queue for a token before falling back to stale data
+PRIORITY_MAX_WAIT = {PRIORITY_HIGH: 3.0, PRIORITY_NORMAL: 1.0, PRIORITY_LOW: 0.25}
+
+# (requests per second, burst) per upstream host
+HOST_RATE_LIMITS = {
+    "api.open-meteo.com": (1.0, 10),
+}
+DEFAULT_RATE_LIMIT = (0.2, 4)
+
+# Named budgets kept separate from a host's main bucket, e.g. image downloads
+# from a publisher CDN should not eat into that publisher's feed budget
+BUDGET_RATE_LIMITS = {
+    "images": (2.0, 8),
+}
+
+# A result built while an upstream had nothing to give (over budget or failing,
+# with no stale copy) is only kept this long, so it is retried soon
+DEGRADED_TTL = 15
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens/second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_token(self):
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class RateGovernor:
+    """Process-wide per-host token buckets with priority-ordered waiters"""
+
+    def __init__(self, limits=None, default=DEFAULT_RATE_LIMIT):
+        self.limits = limits or HOST_RATE_LIMITS
+        self.default = default
+        self.buckets = OrderedDict()
+        self.waiters = defaultdict(list)
+        self.cond = threading.Condition()
+        self.sequence = itertools.count()
+        self.stats = defaultdict(int)
+        self.local = threading.local()  # per-thread count of empty governed_get calls
+
+    def _bucket(self, host, limit=None):
+        if host not in self.buckets:
+            if len(self.buckets) >= RATE_GOVERNOR_MAX_HOSTS:
+                self._prune(time.monotonic())
+            self.buckets[host] = TokenBucket(*(limit or self.limits.get(host, self.default)))
+        self.buckets.move_to_end(host)
+        return self.buckets[host]
     
-    st.markdown(f"""
-    <div class="market-card">
-        <div class="market-header">
-            <span class="market-name">{name}</span>
-            <span class="badge" style="color: {color}; border-color: {color};">
+    def _prune(self, now):
+        for host, bucket in list(self.buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity and not self.waiters.get(host):
+                del self.buckets[host]
+        # Prune well below the cap so a stream of new hosts doesn't rescan every time
+        for host in list(self.buckets):
+            if len(self.buckets) < RATE_GOVERNOR_MAX_HOSTS * 3 // 4:
+                break
+            if not self.waiters.get(host):
+                del self.buckets[host]
+
+    def acquire(self, host, priority=PRIORITY_NORMAL, timeout=None, limit=None):
+        """Take a token for `host`, queueing behind higher-priority callers
+
+        Returns False if no token could be granted within `timeout` seconds.
+        `limit` overrides the (rate, burst) used when the bucket is created.
+        """
+        timeout = PRIORITY_MAX_WAIT[priority] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        entry = (priority, next(self.sequence))
+        with self.cond:
+            bucket = self._bucket(host, limit)
+            queue = self.waiters[host]
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    at_head = queue[0] == entry
+                    if at_head and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        self.stats["granted"] += 1
+                        return True
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self.stats["throttled"] += 1
+                        return False
+                    self.cond.wait(min(remaining, bucket.time_until_token()) if at_head else remaining)
+            finally:
+                queue.remove(entry)
+                if queue:
+                    heapq.heapify(queue)
+                else:
+                    del self.waiters[host]
+                self.cond.notify_all()
+
+class StaleStore:
+    """The last good upstream payload per URL, held in the payload cache
+
+    Bodies count against NEXUS_CACHE_MB alongside everything else and are
+    evicted with it; an evicted body just means no stale fallback for that URL.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def put(self, url, payload):
+        self.cache.put(("stale", url), payload)
+
+    def get(self, url):
+        return self.cache.get(("stale", url))
+
+@st.cache_resource
+def get_rate_governor():
+    """Shared rate governor for every session in this process"""
+    return RateGovernor()
+
+@st.cache_resource
+def get_stale_store():
+    """Shared last-known-good payloads for every session in this process"""
+    return StaleStore(get_payload_cache())
+
+def _stale_or_miss(governor, stale, url):
+    payload = stale.get(url)
+    if payload is None:
+        governor.local.misses = upstream_misses() + 1
+    return payload
+
+def upstream_misses():
+    """How many governed_get calls on this thread have come back empty
+
+    Caches compare this before and after building a value; if it moved, the
+    value is a placeholder and gets DEGRADED_TTL instead of the full TTL.
+    """
+    return getattr(get_rate_governor().local, "misses", 0)
+
+def governed_get(url, priority=PRIORITY_NORMAL, timeout=10, remember=True, wait=None, budget=None,
+                 public_only=False, max_bytes=UPSTREAM_MAX_BYTES):
+    """GET an upstream URL within its host budget, else serve the last good body
+
+    Returns the response body as bytes, or None if the host is over budget
+    (or failing) and nothing has been fetched from this URL before. Pass
+    remember=False for bodies with their own cache (e.g. images), `wait` to
+    queue longer than the priority allows, `budget` to draw from a named
+    per-host bucket in BUDGET_RATE_LIMITS, and public_only=True for URLs that
+    came from visitors or feed content. Bodies over `max_bytes` are dropped
+    as they stream in.
+    """
+    governor, stale = get_rate_governor(), get_stale_store()
+    host, limit = urlsplit(url).netloc, None
+    if budget:
+        host, limit = f"{host}#{budget}", BUDGET_RATE_LIMITS[budget]
+    if not governor.acquire(host, priority, wait, limit):
+        governor.stats["served_stale"] += 1
+        return _stale_or_miss(governor, stale, url)
+    requests = lazy_import("requests")
+    hop = url
+    try:
+        for hops in itertools.count():
+            session = upstream_session(hop, public_only)
+            if session is None:
+                governor.stats["blocked"] += 1
+                return None
+            with session:
+                response = session.get(upstream_url(hop), timeout=timeout, allow_redirects=not public_only, stream=True)
+                with response:
+                    if not (public_only and response.is_redirect):
+                        response.raise_for_status()
+                        body = read_capped(response, max_bytes)
+                        break
+            if hops == PUBLIC_MAX_REDIRECTS:
+                raise requests.TooManyRedirects(url)
+            # Follow by hand so every hop is checked and pinned, not just the first
+            hop = urljoin(hop, response.headers["location"])
+    except requests.RequestException:
+        governor.stats["upstream_errors"] += 1
+        return _stale_or_miss(governor, stale, url)
+    except UpstreamTooLarge:
+        # Not a transient failure: no short retry, just the last good body if any
+        governor.stats["oversized"] += 1
+        return stale.get(url)
+    if remember:
+        stale.put(url, body)
+    return body
+
+# ============================================================================
+# PAYLOAD CACHE
+# ============================================================================
+# Parsed feeds and refresh-graph values are kept pickled and compressed under
+# one memory cap, rather than as live objects per argument set.
+
+PAYLOAD_CACHE_BYTES = int(os.environ.get("NEXUS_CACHE_MB", "128")) * 2**20
+
+def payload_codec():
+    """(name, compress, decompress) for the best codec installed, zlib if none"""
+    try:
+        zstandard = lazy_import("zstandard")
+        return "zstd", functools.partial(zstandard.compress, level=3), zstandard.decompress
+    except ImportError:
+        pass
+    try:
+        lz4_frame = lazy_import("lz4.frame")
+        return "lz4", lz4_frame.compress, lz4_frame.decompress
+    except ImportError:
+        pass
+    return "zlib", functools.partial(zlib.compress, level=6), zlib.decompress
+
+class PayloadCache:
+    """Memory-capped LRU of pickled, compressed values
+
+    Values are compressed once when stored and decompressed only when read,
+    so an entry nobody asks for costs just its compressed size. Once the cap
+    is reached the least recently read entries go first; expired entries are
+    dropped when they are next looked up.
+    """
+
+    def __init__(self, max_bytes=PAYLOAD_CACHE_BYTES):
+        self.codec, self._compress, self._decompress = payload_codec()
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()    # key -> (blob, raw size, expires_at)
+        self.lock = threading.Lock()
+        self.total = 0                  # compressed bytes held
+        self.raw_total = 0              # what the same entries take pickled
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def _drop(self, key):
+        blob, raw_size, _ = self.entries.pop(key)
+        self.total -= len(blob)
+        self.raw_total -= raw_size
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.time():
+                self._drop(key)
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return default
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return pickle.loads(self._decompress(entry[0]))
+
+    def put(self, key, value, ttl=None):
+        """Store `value`, returning a digest of it so callers can spot changes"""
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        blob = self._compress(raw)
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            if len(blob) <= self.max_bytes:
+                self.entries[key] = (blob, len(raw), time.time() + ttl if ttl else None)
+                self.total += len(blob)
+                self.raw_total += len(raw)
+            while self.total > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.stats["evictions"] += 1
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def __contains__(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.time())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total = self.raw_total = 0
+
+    def summary(self):
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(
+                self.stats,
+                codec=self.codec,
+                entries=len(self.entries),
+                bytes=self.total,
+                raw_bytes=self.raw_total,
+                ratio=self.raw_total / self.total if self.total else 1.0,
+                hit_rate=self.stats["hits"] / lookups if lookups else 0.0,
+            )
+
+@st.cache_resource
+def get_payload_cache():
+    """Shared payload cache for every session in this process"""
+    return PayloadCache()
+
+def compressed_cache(ttl):
+    """Drop-in for st.cache_data(ttl=...) backed by the shared PayloadCache
+
+    As with st.cache_data, parameters whose names start with an underscore
+    are left out of the cache key.
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__,) + tuple(
+                (name, value) for name, value in bound.arguments.items() if not name.startswith("_")
+            )
+            cache, missing = get_payload_cache(), object()
+            value = cache.get(key, missing)
+            if value is missing:
+                misses = upstream_misses()
+                value = func(*args, **kwargs)
+                cache.put(key, value, ttl if upstream_misses() == misses else min(ttl, DEGRADED_TTL))
+            return value
+        return cached
+    return decorate
+
+# ============================================================================
+# ARTICLE INGEST
+# ============================================================================
+
+SUMMARY_CHARS = 200
+FEED_ENTRY_LIMIT = 50      # entries kept per feed per fetch
+ARTICLE_WINDOW = 300       # articles kept per category
+NEWS_PAGE_SIZE = 12        # cards rendered per rerun
+SAFE_LINK_SCHEMES = ("http", "https")
+
+class _TextExtractor(HTMLParser):
+    """Collect the visible text of an HTML fragment, dropping scripts and styles"""
+
+    SKIP = {"script", "style", "noscript", "iframe"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0
+        self.image = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self.skipping += 1
+        elif tag == "img" and self.image is None:
+            self.image = dict(attrs).get("src")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self.skipping:
+            self.skipping -= 1
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+def extract_html(raw):
+    """Return (visible text, first <img> src) of an HTML fragment"""
+    if not raw:
+        return "", None
+    extractor = _TextExtractor()
+    extractor.feed(raw)
+    extractor.close()
+    return " ".join("".join(extractor.parts).split()), extractor.image
+
+def html_to_text(raw):
+    """Strip tags and entities from an HTML fragment and collapse whitespace"""
+    return extract_html(raw)[0]
+
+def excerpt(text, limit=SUMMARY_CHARS):
+    """Cut text at a word boundary no longer than `limit` characters"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] if " " in text[:limit] else text[:limit]
+    return cut.rstrip(" ,;:-–—.") + "…"
+
+def parse_published(entry, fallback):
+    """Return an entry's publication time as a UTC epoch int"""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else fallback
+
+def safe_link(link):
+    return link if urlsplit(link).scheme in SAFE_LINK_SCHEMES else "#"
+
+def entry_image(entry, summary_image):
+    """Best image URL for an entry: media:thumbnail, media:content, enclosure, then inline <img>"""
+    for thumb in entry.get("media_thumbnail") or []:
+        if thumb.get("url"):
+            return thumb["url"]
+    for media in entry.get("media_content") or []:
+        if media.get("url") and (media.get("medium") == "image" or media.get("type", "").startswith("image/")):
+            return media["url"]
+    for enclosure in entry.get("enclosures") or []:
+        if enclosure.get("href") and enclosure.get("type", "").startswith("image/"):
+            return enclosure["href"]
+    return summary_image
+
+def build_news_card(article, thumb_src=None):
+    """Pre-render the escaped news card markup for an article"""
+    thumb = (
+        f'<img class="news-thumb" src="{thumb_src}" alt="" width="{THUMB_SIZE[0]}" height="{THUMB_SIZE[1]}" loading="lazy">'
+        if thumb_src else ""
+    )
+    return f"""
+    <div class="news-card">
+        {thumb}
+        <div class="news-source">
+            <span>📡</span>
+            <span>{html.escape(article['source'])}</span>
+            <span class="news-time">{article['published']}</span>
+        </div>
+        <div class="news-title">
+            <a href="{html.escape(article['link'], quote=True)}" target="_blank" rel="noopener noreferrer">{html.escape(article['title'])}</a>
+        </div>
+        <div class="news-summary">
+            {html.escape(article['summary'])}
+        </div>
+    </div>
+    """
+
+def normalize_article(entry, source, fetched_at):
+    """Turn a raw feed entry into a clean, render-ready article
+
+    Everything the renderers need is computed here, once per fetch, so a
+    rerun only concatenates cached strings and sorts on an integer.
+    """
+    published_ts = parse_published(entry, fetched_at)
+    article = {
+        "title": html_to_text(entry.get("title", "")) or "Untitled",
+        "link": safe_link(entry.get("link", "")),
+        "published_ts": published_ts,
+        "published": time.strftime("%a, %d %b %H:%M", time.gmtime(published_ts)),
+        "source": html_to_text(source) or "Unknown Source",
+    }
+    summary, summary_image = extract_html(entry.get("summary", entry.get("description", "")))
+    article["summary"] = excerpt(summary)
+    article["card_html"] = build_news_card(article)
+    
+    image_url = safe_link(entry_image(entry, summary_image) or "")
+    if image_url != "#":
+        article["image_url"] = image_url
+        article["thumb_key"] = thumbnail_key(image_url)
+        article["card_html_thumb"] = build_news_card(article, f"{THUMB_URL_PREFIX}/{article['thumb_key']}.webp")
+    return article
+
+# ============================================================================
+# THUMBNAIL CACHE
+# ============================================================================
+
+# Thumbnails are written under Streamlit's app static folder (enabled in
+# .streamlit/config.toml) so the browser loads them from our own origin.
+# Names are content-addressed by source URL, so they never change and a
+# fronting proxy can mark /app/static/thumbs/ as immutable.
+THUMB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "thumbs")
+THUMB_URL_PREFIX = "app/static/thumbs"
+THUMB_SIZE = (120, 80)
+THUMB_QUALITY = 70
+THUMB_CACHE_BYTES = int(os.environ.get("NEXUS_THUMB_CACHE_MB", "64")) * 2**20
+THUMB_MAX_SOURCE_BYTES = 8 * 2**20
+THUMB_MAX_SOURCE_PIXELS = 16_000_000    # ~64 MB decoded; tiny PNGs can declare far more
+THUMB_WORKERS = 4
+THUMB_WAIT = 30             # background downloads may queue this long for a token
+THUMB_RETRY_AFTER = 600     # seconds before a failed image is tried again
+THUMB_FAILED_MAX = 4096     # failed images remembered; the oldest are forgotten first
+
+def thumbnail_key(url):
+    return hashlib.sha1(url.encode()).hexdigest()
+
+class ThumbnailCache:
+    """Size-bounded on-disk LRU of small WebP thumbnails
+
+    `ensure` is called for each visible card on every rerun: a hit only moves
+    the key to the back of an in-memory LRU, a miss queues one background
+    download and the card renders without an image until it lands.
+    """
+
+    def __init__(self, directory=THUMB_DIR, max_bytes=THUMB_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()    # key -> size in bytes, least recently used first
+        self.total = 0
+        self.pending = set()
+        self.failed = {}            # key -> time after which it may be retried
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=THUMB_WORKERS, thread_name_prefix="thumbs")
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        for name in os.listdir(directory):
+            if name.endswith(".webp"):
+                stat = os.stat(os.path.join(directory, name))
+                existing.append((stat.st_atime, name[:-5], stat.st_size))
+        for _, key, size in sorted(existing):
+            self.entries[key] = size
+            self.total += size
+        self._evict()
+
+    def ensure(self, url, key):
+        """True if the thumbnail is on disk; otherwise schedule it and return False"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return True
+            if key in self.pending or self.failed.get(key, 0) > time.time():
+                return False
+            self.failed.pop(key, None)
+            self.pending.add(key)
+        self.pool.submit(self._build, url, key)
+        return False
+
+    def _build(self, url, key):
+        size = None
+        try:
+            # Oversized sources are refused by Content-Length or cut off mid-download
+            data = governed_get(url, PRIORITY_LOW, remember=False, wait=THUMB_WAIT, budget="images",
+                                public_only=True, max_bytes=THUMB_MAX_SOURCE_BYTES)
+            if data:
+                size = self._encode(data, key)
+        except Exception as e:
+            size = None
+        with self.lock:
+            self.pending.discard(key)
+            if size is None:
+                self._fail(key)
+                return
+            self.entries[key] = size
+            self.total += size
+            self._evict()
+
+    def _fail(self, key):
+        now = time.time()
+        self.failed[key] = now + THUMB_RETRY_AFTER
+        if len(self.failed) > THUMB_FAILED_MAX:
+            for stale in [stale for stale, retry_at in self.failed.items() if retry_at <= now]:
+                del self.failed[stale]
+            # Entries share one retry delay, so insertion order is expiry order
+            while len(self.failed) > THUMB_FAILED_MAX:
+                del self.failed[next(iter(self.failed))]
+
+    def _encode(self, data, key):
+        Image = lazy_import("PIL.Image")
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", (THUMB_SIZE[0] * 2, THUMB_SIZE[1] * 2))
+            # Only the header has been read so far; refuse before decoding pixels
+            if img.size[0] * img.size[1] > THUMB_MAX_SOURCE_PIXELS:
+                raise ValueError(f"source image too large: {img.size[0]}x{img.size[1]}")
+            thumb = lazy_import("PIL.ImageOps").fit(img.convert("RGB"), THUMB_SIZE, Image.LANCZOS)
+        path = os.path.join(self.directory, f"{key}.webp")
+        tmp = f"{path}.tmp"
+        thumb.save(tmp, "WEBP", quality=THUMB_QUALITY, method=4)
+        os.replace(tmp, path)
+        return os.path.getsize(path)
+
+    def _evict(self):
+        while self.total > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.total -= size
+            try:
+                os.remove(os.path.join(self.directory, f"{key}.webp"))
+            except OSError:
+                pass
+
+@st.cache_resource
+def get_thumbnail_cache():
+    """Shared thumbnail cache, or None if Pillow is unavailable"""
+    try:
+        lazy_import("PIL.Image")
+    except ImportError:
+        return None
+    return ThumbnailCache()
+
+# ============================================================================
+# WEBSUB PUSH UPDATES
+# ============================================================================
+
+# Set NEXUS_WEBSUB_CALLBACK to a base URL hubs can reach (e.g.
+# https://nexus.example.com/websub) to subscribe to feeds that advertise a hub.
+# The callback server listens on NEXUS_WEBSUB_PORT; a reverse proxy should map
+# the public callback path onto it.
+WEBSUB_CALLBACK = os.environ.get("NEXUS_WEBSUB_CALLBACK", "").rstrip("/")
+WEBSUB_PORT = int(os.environ.get("NEXUS_WEBSUB_PORT", "8765"))
+WEBSUB_LEASE_SECONDS = 86400
+WEBSUB_RENEW_MARGIN = 0.1           # renew when 10% of the lease is left
+WEBSUB_PENDING_TIMEOUT = 300        # retry if the hub never verifies
+WEBSUB_MAX_BODY = 2 * 2**20         # largest content distribution accepted
+WEBSUB_SIGNATURES = {"sha1": hashlib.sha1, "sha256": hashlib.sha256,
+                     "sha384": hashlib.sha384, "sha512": hashlib.sha512}
+
+class WebSubSubscriber:
+    """WebSub (PubSubHubbub) subscriber feeding pushed entries into the article pipeline
+
+    Each polled feed URL that advertises a hub gets its own callback path and
+    HMAC secret. Once the hub verifies intent, feed_articles reads that feed from
+    the push store instead of polling it; if the lease lapses or the hub never
+    confirms, the feed silently falls back to polling.
+    """
+
+    def __init__(self, callback_base, port):
+        self.callback_base = callback_base
+        self.subscriptions = {}     # feed url -> subscription state
+        self.by_token = {}          # callback token -> feed url
+        self.store = {}             # feed url -> newest-first articles
+        self.lock = threading.Lock()
+        self.stats = defaultdict(int)
+        self.server = ThreadingHTTPServer(("0.0.0.0", port), self._handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        subscriber = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _token(self):
+                return urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+
+            def _reply(self, status, body=b""):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                params = dict(parse_qsl(urlsplit(self.path).query))
+                try:
+                    challenge = subscriber.verify(self._token(), params)
+                except ValueError as e:
+                    self._reply(400, str(e).encode())
+                    return
+                if challenge is None:
+                    self._reply(404)
+                else:
+                    self._reply(200, challenge.encode())
+
+            def do_POST(self):
+                # The listener is public: turn away unknown tokens and odd sizes unread
+                if not subscriber.knows(self._token()):
+                    self._reply(410)
+                    return
+                length = self.headers.get("Content-Length", "0").strip()
+                if not (length.isascii() and length.isdigit()):
+                    self._reply(400, b"bad Content-Length")
+                    return
+                if int(length) > WEBSUB_MAX_BODY:
+                    self._reply(413)
+                    return
+                body = self.rfile.read(int(length))
+                known = subscriber.receive(self._token(), body, self.headers.get("X-Hub-Signature", ""))
+                # Per spec, bad signatures are acknowledged but ignored
+                self._reply(202 if known else 410)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def subscribe(self, url, hub, topic, seed):
+        """Ask `hub` to push `topic`; no-op while a subscription is live or pending"""
+        now = time.time()
+        with self.lock:
+            sub = self.subscriptions.get(url)
+            if sub and (
+                (sub["state"] == "active" and now < sub["renew_at"])
+                or (sub["state"] == "pending" and now < sub["requested_at"] + WEBSUB_PENDING_TIMEOUT)
+                or sub["state"] == "denied"
+            ):
+                return
+            if sub:
+                # Renewals keep the token, secret and live state until the hub re-verifies
+                sub.update(hub=hub, topic=topic, requested_at=now, renew_at=now + WEBSUB_PENDING_TIMEOUT)
+                if sub["state"] != "active":
+                    sub["state"] = "pending"
+            else:
+                sub = {
+                    "hub": hub, "topic": topic, "token": secrets.token_urlsafe(12),
+                    "secret": secrets.token_hex(16), "state": "pending",
+                    "requested_at": now, "expires": 0, "renew_at": 0,
+                }
+                self.subscriptions[url] = sub
+            token = sub["token"]
+            self.by_token[token] = url
+            self.store.setdefault(url, list(seed))
+        threading.Thread(target=self._request, args=(sub,), daemon=True).start()
+
+    def _request(self, sub):
+        # Hub addresses come from feed content, so they get the same check as pasted feeds
+        session = upstream_session(sub["hub"], public_only=True)
+        if session is None:
+            self.stats["request_errors"] += 1
+            return
+        try:
+            with session:
+                session.post(upstream_url(sub["hub"]), allow_redirects=False, data={
+                    "hub.mode": "subscribe",
+                    "hub.topic": sub["topic"],
+                    "hub.callback": f"{self.callback_base}/{sub['token']}",
+                    "hub.secret": sub["secret"],
+                    "hub.lease_seconds": WEBSUB_LEASE_SECONDS,
+                }, timeout=10).raise_for_status()
+            self.stats["requested"] += 1
+        except Exception as e:
+            self.stats["request_errors"] += 1
+
+    def forget(self, url):
+        """Drop a feed's subscription and pushed entries; later pushes to it get 410 Gone"""
+        with self.lock:
+            sub = self.subscriptions.pop(url, None)
+            if sub:
+                self.by_token.pop(sub["token"], None)
+            self.store.pop(url, None)
+
+    def knows(self, token):
+        with self.lock:
+            return token in self.by_token
+
+    def verify(self, token, params):
+        """Answer a hub's intent verification; returns the challenge or None
+
+        Raises ValueError if hub.lease_seconds is not a positive whole number.
+        """
+        with self.lock:
+            url = self.by_token.get(token)
+            sub = self.subscriptions.get(url)
+            if not sub or params.get("hub.topic") != sub["topic"]:
+                return None
+            mode = params.get("hub.mode")
+            if mode == "denied":
+                sub["state"] = "denied"
+                return ""
+            if mode != "subscribe" or "hub.challenge" not in params:
+                return None
+            lease = params.get("hub.lease_seconds", str(WEBSUB_LEASE_SECONDS)).strip()
+            if not (lease.isascii() and lease.isdigit()) or int(lease) == 0:
+                raise ValueError("hub.lease_seconds must be a positive integer")
+            lease, now = int(lease), time.time()
+            sub.update(state="active", expires=now + lease, renew_at=now + lease * (1 - WEBSUB_RENEW_MARGIN))
+            return params["hub.challenge"]
+
+    def receive(self, token, body, signature):
+        """Merge a content distribution into the store; False if the token is unknown"""
+        with self.lock:
+            url = self.by_token.get(token)
+            sub = self.subscriptions.get(url)
+        if not sub:
+            return False
+        algo, _, digest = signature.partition("=")
+        hasher = WEBSUB_SIGNATURES.get(algo)
+        expected = hmac.new(sub["secret"].encode(), body, hasher).hexdigest() if hasher else None
+        if not expected or not hmac.compare_digest(expected, digest):
+            self.stats["bad_signatures"] += 1
+            return True
+        try:
+            pushed = parse_feed(body, int(time.time()))["articles"]
+        except Exception as e:
+            return True
+        with self.lock:
+            merged = {article["link"]: article for article in self.store.get(url, [])}
+            merged.update((article["link"], article) for article in pushed)
+            self.store[url] = sorted(merged.values(), key=lambda article: article["published_ts"], reverse=True)[:FEED_ENTRY_LIMIT]
+        self.stats["pushes"] += 1
+        # Refetch the feed's node on the next rerun so the push shows right away
+        get_refresh_graph().invalidate(("feed", (url,)))
+        return True
+
+    def is_live(self, url):
+        """True if `url` has a verified, unexpired subscription"""
+        sub = self.subscriptions.get(url)
+        if not sub or sub["state"] != "active" or time.time() >= sub["expires"]:
+            return False
+        if time.time() >= sub["renew_at"]:
+            self.subscribe(url, sub["hub"], sub["topic"], [])
+        return True
+
+    def articles(self, url):
+        with self.lock:
+            return self.store.get(url, [])
+
+    def live_count(self):
+        return sum(self.is_live(url) for url in list(self.subscriptions))
+
+@st.cache_resource
+def get_websub_subscriber():
+    """Start the WebSub callback server once per process, if configured"""
+    if not WEBSUB_CALLBACK:
+        return None
+    try:
+        return WebSubSubscriber(WEBSUB_CALLBACK, WEBSUB_PORT)
+    except OSError as e:
+        print(f"[nexus] WebSub disabled: cannot listen on :{WEBSUB_PORT} ({e})", file=sys.stderr)
+        return None
+
+# One tab and one refresh-graph node per category; adding an entry here is all
+# a new category needs
+NEWS_CATEGORIES = {
+    "world": {
+        "label": "🌍 WORLD",
+        "priority": PRIORITY_HIGH,
+        "feeds": [
+            "https://feeds.reuters.com/Reuters/worldNews",
+            "https://feeds.bbci.co.uk/news/world/rss.xml",
+            "https://rss.apnews.com/AP-Top-News"
+        ]
+    },
+    "tech": {
+        "label": "💻 TECH",
+        "priority": PRIORITY_LOW,
+        "feeds": [
+            "https://feeds.feedburner.com/TechCrunch/",
+            "https://www.theverge.com/rss/index.xml",
+            "https://hnrss.org/frontpage"
+        ]
+    },
+    "science": {
+        "label": "🧬 SCIENCE",
+        "priority": PRIORITY_LOW,
+        "feeds": [
+            "https://www.sciencedaily.com/rss/top/science.xml",
+            "https://rss.nytimes.com/services/xml/rss/nyt/Science.xml"
+        ]
+    },
+    "business": {
+        "label": "💼 BUSINESS",
+        "priority": PRIORITY_LOW,
+        "feeds": [
+            "https://feeds.reuters.com/reuters/businessNews",
+            "https://feeds.bbci.co.uk/news/business/rss.xml"
+        ]
+    }
+}
+
+# Country-specific feeds for the LOCAL tab, keyed by ISO country code
+REGIONAL_FEEDS = {
+    "IN": [
+        "https://timesofindia.indiatimes.com/rssfeedstopstories.cms",
+        "https://www.thehindu.com/news/national/feeder/default.rss"
+    ],
+    "US": [
+        "https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml",
+        "https://feeds.a.dj.com/rss/RSSWorldNews.xml"
+    ],
+    "GB": [
+        "https://feeds.bbci.co.uk/news/uk/rss.xml"
+    ],
+    "JP": [
+        "https://www.japantimes.co.jp/feed/"
+    ],
+    "AU": [
+        "https://www.abc.net.au/news/feed/51120/rss.xml"
+    ]
+}
+
+def parse_feed(content, fetched_at):
+    """Parse a feed document into normalized articles plus its WebSub links"""
+    feed = lazy_import("feedparser").parse(content)
+    source = feed.feed.get("title", "Unknown Source")
+    links = feed.feed.get("links", [])
+    articles = [normalize_article(entry, source, fetched_at) for entry in feed.entries[:FEED_ENTRY_LIMIT]]
+    articles.sort(key=lambda article: article["published_ts"], reverse=True)
+    return {
+        "articles": articles,
+        "hub": next((link.get("href") for link in links if link.get("rel") == "hub"), None),
+        "topic": next((link.get("href") for link in links if link.get("rel") == "self"), None),
+    }
+
+@compressed_cache(ttl=300)
+def fetch_feed(url, _priority=PRIORITY_NORMAL):
+    """Poll a single RSS feed"""
+    content = governed_get(url, _priority, public_only=url not in feed_catalog())
+    try:
+        if content is not None:
+            return parse_feed(content, int(time.time()))
+    except Exception as e:
+        pass
+    return {"articles": [], "hub": None, "topic": None}
+
+def feed_articles(url, _priority=PRIORITY_NORMAL):
+    """One feed's articles, newest first
+
+    Feeds with a live WebSub subscription are read from the push store;
+    everything else falls back to the per-feed polling cache.
+    """
+    subscriber = get_websub_subscriber()
+    if subscriber and subscriber.is_live(url):
+        articles = subscriber.articles(url)
+    else:
+        feed = fetch_feed(url, _priority=_priority)
+        if subscriber and feed["hub"]:
+            subscriber.subscribe(url, feed["hub"], feed["topic"] or url, feed["articles"])
+        articles = feed["articles"]
+    # Pasted feeds are matched per session at render time instead
+    if url in feed_catalog():
+        get_watchlist().scan(articles)
+    return articles
+
+def forget_feed(url):
+    """Release per-feed state once nobody has read the feed for a while"""
+    subscriber = get_websub_subscriber()
+    if subscriber:
+        subscriber.forget(url)
+
+def merge_feeds(feeds, limit=ARTICLE_WINDOW):
+    """Merge newest-first article lists into one, keeping the first copy of each story"""
+    seen, merged = set(), []
+    for article in heapq.merge(*feeds, key=lambda article: article["published_ts"], reverse=True):
+        # The same story is often syndicated by several feeds
+        key = article["link"] if article["link"] != "#" else article["title"]
+        if key not in seen:
+            seen.add(key)
+            merged.append(article)
+            if len(merged) == limit:
+                break
+    return merged
+
+def news_feed_urls(category, region=None):
+    """Feed URLs behind a news category (or a country's LOCAL tab)"""
+    if category == "local":
+        return REGIONAL_FEEDS.get(region, [])
+    return NEWS_CATEGORIES.get(category, NEWS_CATEGORIES["world"])["feeds"]
+
+def fetch_news(category, feeds, region=None):
+    """Merge a category's per-feed article lists, newest first
+
+    Runs as a derived graph node over one ("feed", (url,)) node per feed, so
+    it recomputes whenever any of those feeds changes, pushes included.
+    """
+    articles = merge_feeds([articles or [] for articles in feeds.values()])
+    get_trending_topics().ingest(category, articles)
+    return articles
+
+@functools.lru_cache(maxsize=1)
+def feed_catalog():
+    """Every built-in feed URL, labelled for the subscription picker"""
+    catalog = {}
+    for spec in NEWS_CATEGORIES.values():
+        for url in spec["feeds"]:
+            catalog.setdefault(url, f"{spec['label']} • {urlsplit(url).netloc}")
+    for country_code, urls in REGIONAL_FEEDS.items():
+        for url in urls:
+            catalog.setdefault(url, f"📍 {country_code} • {urlsplit(url).netloc}")
+    return catalog
+
+def fetch_weather(lat, lon, _priority=PRIORITY_NORMAL):
+    """Fetch weather data from Open-Meteo API
+
+    Keyed on coordinates only; callers add the display name they want.
+    """
+    try:
+        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true&hourly=temperature_2m,precipitation_probability&timezone=auto"
+        data = json.loads(governed_get(url, _priority))
+        current = data.get("current_weather", {})
+        
+        # Weather code to emoji mapping
+        wcode = current.get("weathercode", 0)
+        conditions = {
+            0: ("Clear Sky", "☀️"),
+            1: ("Mainly Clear", "🌤️"),
+            2: ("Partly Cloudy", "⛅"),
+            3: ("Overcast", "☁️"),
+            45: ("Foggy", "🌫️"),
+            48: ("Rime Fog", "🌫️"),
+            51: ("Light Drizzle", "🌦️"),
+            61: ("Rain", "🌧️"),
+            71: ("Snow", "❄️"),
+            80: ("Rain Showers", "🌧️"),
+            95: ("Thunderstorm", "⛈️"),
+        }
+        
+        for code, (desc, icon) in sorted(conditions.items(), reverse=True):
+            if wcode >= code:
+                condition_desc, condition_icon = desc, icon
+                break
+        else:
+            condition_desc, condition_icon = "Unknown", "❓"
+        
+        return {
+            "temp": current.get("temperature", "--"),
+            "speed": current.get("windspeed", "--"),
+            "icon": condition_icon,
+            "condition": condition_desc,
+            "hourly": compact_hourly(data.get("hourly", {})),
+            "fetched_at": int(time.time())
+        }
+    except Exception as e:
+        return {
+            "temp": "--",
+            "speed": "--",
+            "icon": "❓",
+            "condition": "Unknown",
+            "hourly": {},
+            "fetched_at": int(time.time())
+        }
+
+# Symbols shown in MARKET PULSE; the base/volatility drive the simulation used
+# for any symbol the bar store does not hold
+MARKET_TICKERS = {
+    "S&P 500": {"base": 4500, "volatility": 0.015},
+    "NASDAQ": {"base": 14000, "volatility": 0.02},
+    "DOW": {"base": 35000, "volatility": 0.012},
+    "BTC-USD": {"base": 42000, "volatility": 0.03},
+    "ETH-USD": {"base": 2200, "volatility": 0.035},
+    "GOLD": {"base": 1950, "volatility": 0.008},
+}
+
+def generate_market_data():
+    """Market data from the bar store, simulated for symbols it does not hold"""
+    data = {}
+    store = get_market_store()
+    
+    for ticker, params in MARKET_TICKERS.items():
+        if store and ticker in store:
+            data[ticker] = store.summary(ticker)
+            continue
+        
+        base = params["base"]
+        vol = params["volatility"]
+        
+        # Generate 24-hour price history
+        prices = [base]
+        for _ in range(24):
+            change = random.uniform(-vol, vol) * base
+            prices.append(max(prices[-1] + change, base * 0.8))
+        
+        current = prices[-1]
+        change_pct = ((current - prices[0]) / prices[0]) * 100
+        
+        # Volume simulation
+        volume = random.randint(1000000, 10000000)
+        
+        data[ticker] = {
+            "history": prices,
+            "current": current,
+            "change": change_pct,
+            "volume": volume,
+            "high": max(prices),
+            "low": min(prices),
+            "source": "simulated"
+        }
+    
+    return data
+
+SENTIMENT_POSITIVE = frozenset("""
+agree agreement aid boost breakthrough calm ceasefire celebrate cure deal
+discover discovery ease eases gain gains grow growth hope improve improves
+peace progress rally rebound record recover recovery relief rescue rise
+rises save saved strong success surge win wins
+""".split())
+SENTIMENT_NEGATIVE = frozenset("""
+attack attacks ban collapse conflict crash crisis cut cuts dead death deaths
+decline disaster drop drops fall falls fear fears fire flood kill killed
+killing loss losses outbreak plunge protest recession risk shortage slump
+strike threat threatens violence war warning
+""".split())
+
+def calculate_sentiment_score(news):
+    """Headline sentiment in [-1, 1] across every news category
+
+    Each headline scores by its balance of positive and negative words;
+    headlines with no lean either way are left out of the average.
+    """
+    scores = []
+    for articles in news.values():
+        for article in articles or []:
+            words = TREND_WORD.findall(article["title"].lower())
+            positive = sum(word in SENTIMENT_POSITIVE for word in words)
+            negative = sum(word in SENTIMENT_NEGATIVE for word in words)
+            if positive != negative:
+                scores.append((positive - negative) / (positive + negative))
+    return sum(scores) / len(scores) if scores else 0.0
+
+def generate_world_stats():
+    """Generate interesting world statistics"""
+    return {
+        "active_conflicts": random.randint(15, 30),
+        "global_temp_anomaly": round(random.uniform(0.8, 1.5), 2),
+        "internet_users": round(5.3 + random.uniform(-0.1, 0.1), 2),
+        "co2_ppm": random.randint(415, 425),
+        "crypto_market_cap": random.randint(1500, 2500),
+    }
+
+# ============================================================================
+# DATA SOURCE REGISTRY
+# ============================================================================
+# Every panel's data is a node in one graph. Upstream sources refresh on their
+# own TTL, concurrently; derived nodes recompute only when an input changed.
+
+REFRESH_WORKERS = 8
+NODE_IDLE_EVICT = 3600      # forget nodes (e.g. old custom locations) unused this long
+
+class DataSource:
+    """A named node in the refresh graph
+
+    Upstream sources (no deps) are called as fetch(*args, _priority=...) and
+    refetched once older than `ttl` seconds. Derived sources are called as
+    fetch({dep: value}, *args) whenever one of their dependencies has changed.
+    `deps` lists source names or (name, args) keys, or is a function of the
+    node's args returning them. `evict`, if given, is called with a node's
+    args when the node is dropped after NODE_IDLE_EVICT seconds unused.
+    """
+    def __init__(self, name, fetch, ttl=None, deps=(), priority=PRIORITY_NORMAL, evict=None):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.deps = deps if callable(deps) else tuple(deps)
+        self.priority = priority
+        self.evict = evict
+    
+    @property
+    def derived(self):
+        return bool(self.deps)
+    
+    def dependencies(self, args):
+        deps = self.deps(*args) if callable(self.deps) else self.deps
+        return [dep if isinstance(dep, tuple) else (dep, ()) for dep in deps]
+
+class DataRegistry:
+    """Declared data sources; a source may only depend on ones registered before it"""
+    def __init__(self):
+        self.sources = {}
+    
+    def register(self, name, fetch, ttl=None, deps=(), priority=PRIORITY_NORMAL, evict=None):
+        for dep in ([] if callable(deps) else deps):
+            if (dep[0] if isinstance(dep, tuple) else dep) not in self.sources:
+                raise ValueError(f"{name} depends on unregistered source {dep}")
+        if not deps and ttl is None:
+            raise ValueError(f"upstream source {name} needs a ttl")
+        self.sources[name] = DataSource(name, fetch, ttl, deps, priority, evict)
+    
+    def __getitem__(self, name):
+        return self.sources[name]
+    
+    def __len__(self):
+        return len(self.sources)
+
+class _GraphNode:
+    def __init__(self):
+        self.digest = None          # the value itself lives in the payload cache
+        self.version = 0            # bumped only when the value actually changes
+        self.fetched_at = 0
+        self.used_at = 0
+        self.inputs = None          # dependency versions the value was built from
+        self.lock = threading.Lock()
+
+class RefreshGraph:
+    """Refreshes what a rerun asks for, sharing results across sessions
+
+    Nodes are keyed by (source name, args), so each feed URL and each weather
+    cell is its own node. A stale upstream node has at most one fetch in
+    flight, shared by every session that needs it; sessions wait on that
+    fetch rather than queueing their own, so a slow source ties up one
+    worker, not the pool. Derived nodes then recompute in dependency order,
+    and only if the versions of their inputs moved since they were built.
+    """
+    def __init__(self, registry, cache, workers=REFRESH_WORKERS):
+        self.registry = registry
+        self.cache = cache
+        self.nodes = {}
+        self.inflight = {}          # key -> Future of the fetch currently running
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nexus-refresh")
+        self.stats = {"fetches": 0, "shared": 0, "recomputes": 0, "skipped": 0, "errors": 0}
+    
+    def _node(self, key):
+        with self.lock:
+            node = self.nodes.get(key)
+            if node is None:
+                node = self.nodes[key] = _GraphNode()
+            node.used_at = time.time()
+            return node
+    
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+    
+    def _expand(self, keys, priorities):
+        """`keys` plus everything they depend on, dependencies first
+
+        Returns the order and, per key, the most urgent priority asked of it
+        directly or by anything downstream.
+        """
+        order, urgency = [], {}
+        def visit(key, priority):
+            if key in urgency and urgency[key] <= priority:
+                return
+            urgency[key] = priority
+            for dep in self.registry[key[0]].dependencies(key[1]):
+                visit(dep, priority)
+            if key not in order:
+                order.append(key)
+        for key in keys:
+            visit(key, priorities.get(key, self.registry[key[0]].priority))
+        return order, urgency
+    
+    def _is_stale(self, key):
+        node = self._node(key)
+        return (
+            node.version == 0
+            or time.time() - node.fetched_at >= self.registry[key[0]].ttl
+            or ("node",) + key not in self.cache
+        )
+    
+    def _store(self, key, node, value):
+        digest = self.cache.put(("node",) + key, value)
+        if node.version == 0 or digest != node.digest:
+            node.digest = digest
+            node.version += 1
+    
+    def _value(self, key, fresh, urgency, ctx):
+        """A node's value, rebuilding it if the cache evicted it since the stale check"""
+        # Values produced by this refresh may be too big to have been cached
+        if key in fresh:
+            return fresh[key]
+        missing = object()
+        value = self.cache.get(("node",) + key, missing)
+        if value is not missing:
+            return value
+        if self.registry[key[0]].derived:
+            self._recompute(key, fresh, urgency, ctx)
+        else:
+            ok, value = self._submit(key, urgency[key], ctx).result()
+            if ok:
+                fresh[key] = value
+        return fresh[key] if key in fresh else self.cache.get(("node",) + key)
+    
+    def _submit(self, key, priority, ctx):
+        """The in-flight fetch of `key`, starting one if none is running"""
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is None:
+                future = self.inflight[key] = self.executor.submit(self._fetch, key, priority, ctx)
+            else:
+                self.stats["shared"] += 1
+            return future
+    
+    def _fetch(self, key, priority, ctx=None):
+        """Fetch an upstream node; returns (True, value), or (False, None) on failure"""
+        # The requesting rerun's context lets fetchers use st.cache_* quietly
+        add_script_run_ctx(threading.current_thread(), ctx)
+        source, node = self.registry[key[0]], self._node(key)
+        try:
+            misses = upstream_misses()
+            try:
+                value = source.fetch(*key[1], _priority=priority)
+            except Exception as e:
+                print(f"[nexus] refreshing {source.name}{key[1] or ''} failed: {e}", file=sys.stderr)
+                self._count("errors")
+                return False, None
+            with node.lock:
+                self._store(key, node, value)
+                node.fetched_at = time.time()
+                if upstream_misses() != misses:
+                    # Built from a placeholder: let it go stale after DEGRADED_TTL
+                    node.fetched_at -= max(source.ttl - DEGRADED_TTL, 0)
+            self._count("fetches")
+            return True, value
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+    
+    def _recompute(self, key, fresh, urgency, ctx):
+        source, node = self.registry[key[0]], self._node(key)
+        dep_keys = source.dependencies(key[1])
+        with node.lock:
+            versions = tuple(self._node(dep).version for dep in dep_keys)
+            if node.version and versions == node.inputs and ("node",) + key in self.cache:
+                self._count("skipped")
+                return
+            value = source.fetch({dep: self._value(dep, fresh, urgency, ctx) for dep in dep_keys}, *key[1])
+            self._store(key, node, value)
+            # A dependency rebuilt just now may have moved on from `versions`
+            node.inputs = tuple(self._node(dep).version for dep in dep_keys)
+            fresh[key] = value
+        self._count("recomputes")
+    
+    def _prune(self):
+        cutoff = time.time() - NODE_IDLE_EVICT
+        with self.lock:
+            idle = [key for key, node in self.nodes.items() if node.used_at < cutoff]
+            for key in idle:
+                del self.nodes[key]
+        for name, args in idle:
+            if self.registry[name].evict:
+                self.registry[name].evict(*args)
+    
+    def refresh(self, wanted, priorities=None):
+        """Bring the wanted nodes up to date and return their values
+
+        `wanted` holds source names, or (name, args) tuples for parameterized
+        sources; the result is keyed the same way. `priorities` overrides a
+        source's declared priority per entry, and flows down to what it
+        depends on.
+        """
+        keys = {item: item if isinstance(item, tuple) else (item, ()) for item in wanted}
+        order, urgency = self._expand(keys.values(), {keys[item]: p for item, p in (priorities or {}).items()})
+        
+        ctx, fresh = get_script_run_ctx(suppress_warning=True), {}
+        futures = {
+            key: self._submit(key, urgency[key], ctx)
+            for key in order
+            if not self.registry[key[0]].derived and self._is_stale(key)
+        }
+        for key, future in futures.items():
+            ok, value = future.result()
+            if ok:
+                fresh[key] = value
+        for key in order:
+            if self.registry[key[0]].derived:
+                self._recompute(key, fresh, urgency, ctx)
+        
+        self._prune()
+        return {item: self._value(key, fresh, urgency, ctx) for item, key in keys.items()}
+    
+    def version(self, item):
+        """Version of an up-to-date node, or None if a refresh would refetch or rebuild it"""
+        key = item if isinstance(item, tuple) else (item, ())
+        source = self.registry[key[0]]
+        if not source.derived:
+            return None if self._is_stale(key) else self._node(key).version
+        versions = tuple(self.version(dep) for dep in source.dependencies(key[1]))
+        node = self._node(key)
+        if None in versions or versions != node.inputs or ("node",) + key not in self.cache:
+            return None
+        return node.version
+    
+    def invalidate(self, key=None):
+        """Mark one upstream node, or all of them, stale so the next refresh refetches it"""
+        with self.lock:
+            for node in (self.nodes.values() if key is None else filter(None, [self.nodes.get(key)])):
+                node.fetched_at = 0
+
+def _feed_keys(urls):
+    return [("feed", (url,)) for url in urls]
+
+def build_registry():
+    """Declare every data source the dashboard renders"""
+    registry = DataRegistry()
+    # One node per feed URL, shared by every category and subscription that
+    # includes it. Short TTL since the feed itself sits in fetch_feed's cache;
+    # WebSub pushes mark it stale straight away.
+    registry.register("feed", feed_articles, ttl=60, evict=forget_feed)
+    for category, spec in NEWS_CATEGORIES.items():
+        registry.register(
+            f"news.{category}", functools.partial(fetch_news, category),
+            deps=_feed_keys(spec["feeds"]), priority=spec["priority"],
+        )
+    registry.register(
+        "news.local", functools.partial(fetch_news, "local"),
+        deps=lambda region: _feed_keys(news_feed_urls("local", region)),
+    )
+    registry.register("weather", fetch_weather, ttl=900, priority=PRIORITY_HIGH)
+    registry.register("markets", lambda _priority: generate_market_data(), ttl=60)
+    registry.register("sentiment", calculate_sentiment_score, deps=[f"news.{category}" for category in NEWS_CATEGORIES])
+    return registry
+
+DATA_SOURCES = build_registry()
+
+@st.cache_resource
+def get_refresh_graph():
+    return RefreshGraph(DATA_SOURCES, get_payload_cache())
+
+# ============================================================================
+# MARKET DATA STORE
+# ============================================================================
+
+# Bars ingested with `python streamlit-app.py ingest-market bars.csv` live here
+# as one raw binary file per column per symbol, opened with numpy.memmap so a
+# query only pages in the rows it touches.
+MARKET_DATA_DIR = os.environ.get("NEXUS_MARKET_DATA", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "market"))
+MARKET_COLUMNS = {"ts": "int64", "open": "float64", "high": "float64",
+                  "low": "float64", "close": "float64", "volume": "float64"}
+MARKET_WINDOW_SECONDS = 86400
+MARKET_HISTORY_POINTS = 25
+MARKET_TS_FIELDS = ("ts", "timestamp", "time", "date", "datetime")
+
+def _symbol_slug(symbol):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", symbol).strip("_") or "symbol"
+
+def _parse_bar_time(value):
+    """Epoch seconds (or milliseconds) or ISO-8601, naive times taken as UTC"""
+    value = value.strip()
+    try:
+        number = float(value)
+        return int(number / 1000) if number > 1e11 else int(number)
+    except ValueError:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return calendar.timegm(parsed.utctimetuple())
+
+def _read_manifest(data_dir):
+    try:
+        with open(os.path.join(data_dir, "manifest.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"symbols": {}}
+
+def _truncate_columns(folder, rows):
+    """Cut a symbol's column files back to `rows` rows, dropping anything past them"""
+    np = lazy_import("numpy")
+    for column, dtype in MARKET_COLUMNS.items():
+        path = os.path.join(folder, f"{column}.bin")
+        size = rows * np.dtype(dtype).itemsize
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+def ingest_market_csv(path, data_dir=MARKET_DATA_DIR, symbol=None, chunk_rows=250_000):
+    """Append OHLCV bars from a CSV to the columnar store
+
+    Expects columns symbol, timestamp, open, high, low, close, volume (the
+    symbol column may be omitted if `symbol` is given). Rows are buffered per
+    symbol and flushed every `chunk_rows`, so file size is not bounded by RAM.
+    The manifest is the commit point: rows past its count are cut off before
+    appending and again if the ingest fails. Returns {symbol: rows_added}.
+    """
+    np = lazy_import("numpy")
+    os.makedirs(data_dir, exist_ok=True)
+    manifest = _read_manifest(data_dir)
+    committed = {name: dict(entry) for name, entry in manifest["symbols"].items()}
+    for entry in committed.values():
+        # Leftovers from an earlier ingest that failed before writing the manifest
+        _truncate_columns(os.path.join(data_dir, entry["path"]), entry["rows"])
+    buffers = defaultdict(lambda: {column: [] for column in MARKET_COLUMNS})
+    added, unsorted = defaultdict(int), set()
+    
+    def flush():
+        for name, columns in buffers.items():
+            entry = manifest["symbols"].setdefault(name, {"path": _symbol_slug(name), "rows": 0, "last_ts": None})
+            folder = os.path.join(data_dir, entry["path"])
+            os.makedirs(folder, exist_ok=True)
+            if name not in committed and name not in added:
+                _truncate_columns(folder, 0)
+            ts = np.asarray(columns["ts"], dtype="int64")
+            if (entry["last_ts"] is not None and ts[0] <= entry["last_ts"]) or bool((np.diff(ts) <= 0).any()):
+                unsorted.add(name)
+            for column, dtype in MARKET_COLUMNS.items():
+                with open(os.path.join(folder, f"{column}.bin"), "ab") as f:
+                    np.asarray(columns[column], dtype=dtype).tofile(f)
+            entry["rows"] += len(ts)
+            entry["last_ts"] = max(int(ts.max()), entry["last_ts"] or 0)
+            added[name] += len(ts)
+        buffers.clear()
+    
+    try:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            fields = {name.lower().strip(): name for name in reader.fieldnames or []}
+            ts_field = next((fields[name] for name in MARKET_TS_FIELDS if name in fields), None)
+            if ts_field is None:
+                raise ValueError(f"{path}: no timestamp column (expected one of {', '.join(MARKET_TS_FIELDS)})")
+            if "symbol" not in fields and not symbol:
+                raise ValueError(f"{path}: no symbol column; pass the symbol for this file (--symbol)")
+            pending = 0
+            for row in reader:
+                columns = buffers[row[fields["symbol"]] if "symbol" in fields else symbol]
+                columns["ts"].append(_parse_bar_time(row[ts_field]))
+                close = float(row[fields["close"]])
+                for column in ("open", "high", "low"):
+                    columns[column].append(float(row[fields[column]]) if column in fields else close)
+                columns["close"].append(close)
+                columns["volume"].append(float(row[fields["volume"]]) if "volume" in fields else 0.0)
+                pending += 1
+                if pending >= chunk_rows:
+                    flush()
+                    pending = 0
+            flush()
+    except BaseException:
+        for name, entry in manifest["symbols"].items():
+            _truncate_columns(os.path.join(data_dir, entry["path"]), committed.get(name, {"rows": 0})["rows"])
+        raise
+    
+    # Out-of-order input is rare; sort (and drop duplicate timestamps) one symbol at a time
+    for name in unsorted:
+        entry = manifest["symbols"][name]
+        folder = os.path.join(data_dir, entry["path"])
+        arrays = {column: np.fromfile(os.path.join(folder, f"{column}.bin"), dtype=dtype)
+                  for column, dtype in MARKET_COLUMNS.items()}
+        order = np.argsort(arrays["ts"], kind="stable")
+        ts = arrays["ts"][order]
+        keep = np.append(ts[1:] != ts[:-1], True)   # last write wins
+        for column, values in arrays.items():
+            values[order][keep].tofile(os.path.join(folder, f"{column}.bin"))
+        entry["rows"] = int(keep.sum())
+    
+    tmp = os.path.join(data_dir, "manifest.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(data_dir, "manifest.json"))
+    return dict(added)
+
+class MarketStore:
+    """Read-only, memory-mapped view over the columnar bar store"""
+
+    def __init__(self, data_dir, manifest):
+        self.data_dir = data_dir
+        self.symbols = {name: entry for name, entry in manifest["symbols"].items() if entry["rows"]}
+        self.maps = {}
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    def _column(self, symbol, column):
+        key = (symbol, column)
+        if key not in self.maps:
+            entry = self.symbols[symbol]
+            path = os.path.join(self.data_dir, entry["path"], f"{column}.bin")
+            self.maps[key] = lazy_import("numpy").memmap(
+                path, dtype=MARKET_COLUMNS[column], mode="r", shape=(entry["rows"],)
+            )
+        return self.maps[key]
+
+    def summary(self, symbol, window=MARKET_WINDOW_SECONDS, points=MARKET_HISTORY_POINTS):
+        """Current price, change %, high/low, volume and a sparkline over the last `window` seconds"""
+        np = lazy_import("numpy")
+        ts = self._column(symbol, "ts")
+        close = self._column(symbol, "close")
+        end = len(ts)
+        start = int(np.searchsorted(ts, ts[-1] - window, side="left"))
+        reference = float(close[start - 1] if start else self._column(symbol, "open")[start])
+        current = float(close[-1])
+        history = close[np.linspace(start, end - 1, num=min(points, end - start)).astype("int64")]
+        return {
+            "history": history.tolist(),
+            "current": current,
+            "change": (current - reference) / reference * 100 if reference else 0.0,
+            "volume": int(self._column(symbol, "volume")[start:end].sum()),
+            "high": float(self._column(symbol, "high")[start:end].max()),
+            "low": float(self._column(symbol, "low")[start:end].min()),
+            "source": "file",
+        }
+
+@st.cache_resource
+def _open_market_store(data_dir, manifest_mtime):
+    return MarketStore(data_dir, _read_manifest(data_dir))
+
+def get_market_store():
+    """The market store for MARKET_DATA_DIR, reopened whenever an ingest rewrites it"""
+    try:
+        mtime = os.path.getmtime(os.path.join(MARKET_DATA_DIR, "manifest.json"))
+    except OSError:
+        return None
+    return _open_market_store(MARKET_DATA_DIR, mtime)
+
+# ============================================================================
+# FORECAST CHART
+# ============================================================================
+
+FORECAST_POINTS = 60        # ~1 point per 5-6 px at the side panel's width
+FORECAST_HEIGHT = 160
+
+def compact_hourly(hourly):
+    """Pack Open-Meteo's hourly lists into typed arrays
+
+    Times become int64 seconds (local wall clock, as returned with
+    timezone=auto) and values float32 with NaN for gaps, roughly a tenth of
+    the pickled size of the original lists of strings and floats.
+    """
+    times = hourly.get("time") or []
+    packed = {"time": array("q", (calendar.timegm(time.strptime(t, "%Y-%m-%dT%H:%M")) for t in times))}
+    for field in ("temperature_2m", "precipitation_probability"):
+        values = hourly.get(field) or []
+        packed[field] = array("f", (math.nan if v is None else v for v in values))
+    return packed
+
+def lttb(xs, ys, threshold):
+    """Largest-triangle-three-buckets downsampling; returns the kept indices
+
+    Keeps the first and last points and, from each of `threshold - 2` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average, which preserves the
+    visual peaks and troughs a naive stride would drop.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    kept, a = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+@st.cache_data(ttl=900)
+def build_forecast_figure(lat, lon, fetched_at, theme_name, _hourly):
+    """Plotly figure for the hourly forecast, cached per location snapshot
+
+    `_hourly` is excluded from the cache key; (lat, lon, fetched_at) already
+    identify the snapshot it came from.
+    """
+    t = THEMES[theme_name]
+    times, temps = _hourly["time"], _hourly["temperature_2m"]
+    points = [(x, y) for x, y in zip(times, temps) if not math.isnan(y)]
+    if len(points) < 2:
+        return None
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    kept = lttb(xs, ys, FORECAST_POINTS)
+    precip_by_time = dict(zip(times, _hourly["precipitation_probability"]))
+    labels = [time.strftime("%Y-%m-%dT%H:%M", time.gmtime(xs[i])) for i in kept]
+    
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=[precip_by_time.get(xs[i], math.nan) for i in kept],
+        yaxis="y2",
+        marker_color=t['accent_secondary'],
+        opacity=0.25,
+        hovertemplate='%{y:.0f}% rain<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=labels,
+        y=[ys[i] for i in kept],
+        mode='lines',
+        line=dict(color=t['accent_primary'], width=2.5, shape='spline'),
+        hovertemplate='%{y:.1f}°<extra></extra>'
+    ))
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=FORECAST_HEIGHT,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False, tickformat='%a %Hh', tickfont=dict(color=t['text_muted'], size=10)),
+        yaxis=dict(showgrid=False, ticksuffix='°', tickfont=dict(color=t['text_muted'], size=10)),
+        yaxis2=dict(overlaying='y', side='right', range=[0, 100], visible=False),
+        showlegend=False,
+        bargap=0.1
+    )
+    return fig.to_dict()
+
+# ============================================================================
+# OFFLINE GEOCODING
+# ============================================================================
+
+# GeoNames cities (CC BY 4.0): every city over 100k people plus the largest
+# city of each country. Regenerate from cities15000.txt if more detail is needed.
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.csv")
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+City = namedtuple("City", "name country_code country lat lon population")
+
+def _unit_vector(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+class Gazetteer:
+    """Nearest-city lookup over a static 3-d KD-tree
+
+    Points live on the unit sphere, so straight-line (chord) distance orders
+    neighbours exactly like great-circle distance and no trigonometry is
+    needed during the search.
+    """
+
+    def __init__(self, cities):
+        self.cities = cities
+        self.points = [_unit_vector(c.lat, c.lon) for c in cities]
+        # Flat node arrays: node i splits on axis[i] at points[index[i]]
+        self.index, self.axis, self.left, self.right = [], [], [], []
+        self.root = self._build(list(range(len(cities))), 0)
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            cities = [
+                City(row["name"], row["country_code"], row["country"],
+                     float(row["latitude"]), float(row["longitude"]), int(row["population"]))
+                for row in csv.DictReader(f)
+            ]
+        return cls(cities)
+
+    def _build(self, ids, depth):
+        if not ids:
+            return -1
+        axis = depth % 3
+        ids.sort(key=lambda i: self.points[i][axis])
+        mid = len(ids) // 2
+        node = len(self.index)
+        self.index.append(ids[mid])
+        self.axis.append(axis)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.left[node] = self._build(ids[:mid], depth + 1)
+        self.right[node] = self._build(ids[mid + 1:], depth + 1)
+        return node
+
+    def nearest(self, lat, lon):
+        """Return (City, distance_km) closest to the given coordinates"""
+        target = _unit_vector(lat, lon)
+        best, best_d2 = -1, float("inf")
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            point = self.points[self.index[node]]
+            d2 = (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2 + (point[2] - target[2]) ** 2
+            if d2 < best_d2:
+                best, best_d2 = self.index[node], d2
+            diff = target[self.axis[node]] - point[self.axis[node]]
+            near, far = (self.left[node], self.right[node]) if diff < 0 else (self.right[node], self.left[node])
+            # Far side is only worth visiting if the splitting plane is closer than the best hit
+            if diff * diff < best_d2:
+                stack.append(far)
+            stack.append(near)
+        chord = math.sqrt(best_d2)
+        return self.cities[best], 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+def geohash_encode(lat, lon, precision=5):
+    """Encode coordinates as a geohash string"""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            value = value * 2 + (lon >= mid)
+            lon_lo, lon_hi = (mid, lon_hi) if lon >= mid else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            value = value * 2 + (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def geohash_center(geohash):
+    """Return the (lat, lon) center of a geohash cell"""
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return round((lat_lo + lat_hi) / 2, 4), round((lon_lo + lon_hi) / 2, 4)
+
+@st.cache_resource
+def get_gazetteer():
+    """Load the bundled gazetteer once per process"""
+    return Gazetteer.from_csv(GAZETTEER_PATH)
+
+def resolve_location(lat, lon, precision=5):
+    """Resolve coordinates to the nearest city and a snapped cache key
+
+    Precision 5 cells are roughly 5 km across, so nearby custom coordinates
+    share one weather cache entry.
+    """
+    city, distance = get_gazetteer().nearest(lat, lon)
+    geohash = geohash_encode(lat, lon, precision)
+    snap_lat, snap_lon = geohash_center(geohash)
+    return {
+        "city": city.name,
+        "country": city.country,
+        "country_code": city.country_code,
+        "distance_km": distance,
+        "geohash": geohash,
+        "lat": snap_lat,
+        "lon": snap_lon,
+    }
+
+# ============================================================================
+# TRENDING TOPICS
+# ============================================================================
+
+TREND_STOPWORDS = frozenset("""
+a about after again against all also amid among an and any are as at be because been before
+being between both but by can could did does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its just more most new news
+no nor not now of off on once only or other our out over own said same says she should so some
+such than that the their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your year years
+week day today first last says report reports video live watch read update updates one two
+""".split())
+
+# Share-of-recent-mass ratio above which a term is flagged as rising
+TREND_RISING = 1.25
+
+TREND_WORD = re.compile(r"[A-Za-z][A-Za-z'\-]+")
+TREND_PHRASE = re.compile(r"\b(?:[A-Z][a-z]+|[A-Z]{2,})(?:\s+(?:[A-Z][a-z]+|[A-Z]{2,})){1,2}\b")
+
+def extract_terms(article):
+    """Extract distinct keywords and capitalized phrases from an article"""
+    title = article.get("title", "")
+    text = f"{title} {article.get('summary', '')}"
+    terms = set()
+    for phrase in TREND_PHRASE.findall(title):
+        words = phrase.split()
+        if words[0].lower() not in TREND_STOPWORDS:
+            terms.add(phrase)
+    for word in TREND_WORD.findall(text):
+        lowered = word.lower().strip("'-")
+        if len(lowered) >= 4 and lowered not in TREND_STOPWORDS:
+            terms.add(lowered)
+    return terms
+
+class DecayedCountMinSketch:
+    """Count-min sketch with exponential time decay and fixed memory
+
+    Uses forward decay: each increment is weighted by 2^((t - t0) / half_life),
+    so stored counters never need to be touched to age them. Dividing by the
+    current weight gives the decayed count, and relative order is preserved.
+    """
+
+    def __init__(self, width=2048, depth=4, half_life=3600.0):
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self.t0 = time.time()
+        self.rows = [[0.0] * width for _ in range(depth)]
+        self.total = 0.0
+
+    def _weight(self, now):
+        return 2.0 ** ((now - self.t0) / self.half_life)
+
+    def _rescale(self, now):
+        factor = self._weight(now)
+        for row in self.rows:
+            for i, value in enumerate(row):
+                if value:
+                    row[i] = value / factor
+        self.total /= factor
+        self.t0 = now
+        return factor
+
+    def add(self, term, now, count=1.0):
+        """Add a term; returns its scaled estimate after the increment"""
+        weight = self._weight(now)
+        if weight > 1e100:
+            self._rescale(now)
+            weight = 1.0
+        self.total += count * weight
+        estimate = float("inf")
+        for seed, row in enumerate(self.rows):
+            i = hash((seed, term)) % self.width
+            row[i] += count * weight
+            estimate = min(estimate, row[i])
+        return estimate
+
+    def scaled(self, term):
+        return min(row[hash((seed, term)) % self.width] for seed, row in enumerate(self.rows))
+
+    def estimate(self, term, now):
+        """Decayed count of a term at time `now`"""
+        return self.scaled(term) / self._weight(now)
+
+    def share(self, term):
+        """Fraction of all decayed mass held by a term"""
+        return self.scaled(term) / self.total if self.total else 0.0
+
+class TrendTracker:
+    """Top-k heavy hitters over a fast and a slow decayed sketch"""
+
+    def __init__(self, k=12, fast_half_life=3600.0, slow_half_life=86400.0, seen_limit=4096):
+        self.k = k
+        self.fast = DecayedCountMinSketch(half_life=fast_half_life)
+        self.slow = DecayedCountMinSketch(half_life=slow_half_life)
+        self.candidates = {}
+        self.seen = OrderedDict()
+        self.seen_limit = seen_limit
+
+    def ingest(self, articles, now=None):
+        """Count terms from articles not seen before; O(new articles)"""
+        now = now or time.time()
+        for article in articles:
+            key = article.get("link") or article.get("title")
+            if key in self.seen:
+                continue
+            self.seen[key] = None
+            if len(self.seen) > self.seen_limit:
+                self.seen.popitem(last=False)
+            for term in extract_terms(article):
+                self.slow.add(term, now)
+                self.candidates[term] = self.fast.add(term, now)
+        self._prune()
+
+    def _prune(self):
+        # Re-score from the sketch: a rescale inside add() changes the scale of
+        # every counter, and stored scores from before it would outrank new ones
+        self.candidates = {term: self.fast.scaled(term) for term in self.candidates}
+        # Keep a few spares beyond k so terms just below the cut can climb back
+        capacity = self.k * 4
+        if len(self.candidates) > capacity:
+            keep = heapq.nlargest(capacity, self.candidates.items(), key=lambda item: item[1])
+            self.candidates = dict(keep)
+
+    def top(self, n=None, now=None):
+        """Return [(term, decayed_count, rising_ratio)] sorted by decayed count"""
+        now = now or time.time()
+        n = n or self.k
+        results = []
+        for term, _ in heapq.nlargest(n, self.candidates.items(), key=lambda item: item[1]):
+            fast = self.fast.estimate(term, now)
+            slow_share = self.slow.share(term)
+            # Share of recent mass vs share of long-run mass; > 1 means accelerating
+            rising = self.fast.share(term) / slow_share if slow_share else 0.0
+            results.append((term, fast, rising))
+        return results
+
+class TrendingTopics:
+    """Per-category trend trackers shared by every session"""
+
+    def __init__(self):
+        self.trackers = defaultdict(TrendTracker)
+        self.lock = threading.Lock()
+
+    def ingest(self, category, articles):
+        with self.lock:
+            self.trackers[category].ingest(articles)
+
+    def top(self, category, n=6):
+        with self.lock:
+            if category not in self.trackers:
+                return []
+            return self.trackers[category].top(n)
+
+@st.cache_resource
+def get_trending_topics():
+    """Process-wide trending topics store"""
+    return TrendingTopics()
+
+# ============================================================================
+# WATCHLIST
+# ============================================================================
+# Shared watched terms (the watchlist file and the market symbols) are compiled
+# into one Aho-Corasick automaton; each article is scanned once per watchlist
+# version as it comes through feed_articles. Terms added in the sidebar belong
+# to that visitor's session and get their own small automaton.
+
+WATCHLIST_PATH = os.environ.get("NEXUS_WATCHLIST", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "watchlist.txt"))
+WATCHLIST_ALERTS = 50           # recent alerts kept for the sidebar
+WATCHLIST_MEMO = 20000          # articles remembered as already scanned
+WATCHLIST_SESSION_TERMS = 20    # sidebar terms per session
+WATCHLIST_SESSION_MEMO = 5000   # articles remembered per session
+
+class AhoCorasick:
+    """Multi-pattern matcher: one pass over the text finds every term
+
+    A trie of the terms with failure links, so the cost of a search is linear
+    in the length of the text plus the number of matches, however many terms
+    are compiled in.
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for term in terms:
+            node = 0
+            for char in term:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                node = child
+            self.out[node] += (term,)
+        
+        # Breadth-first, so every failure target is finished before it is used
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                target = self.fail[node]
+                while target and char not in self.goto[target]:
+                    target = self.fail[target]
+                self.fail[child] = self.goto[target].get(char, 0)
+                self.out[child] += self.out[self.fail[child]]
+
+    def search(self, text):
+        """Yield (start, term) for every occurrence of a term in `text`"""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for term in out[node]:
+                yield end - len(term), term
+
+def read_watchlist(path):
+    """Terms from a watchlist file: one per line, `#` starts a comment"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+    except OSError:
+        return []
+
+def article_key(article):
+    return article["link"] if article["link"] != "#" else article["title"]
+
+def compile_terms(raw_terms):
+    """(lowercase -> display form, lowercase terms that must match case exactly)
+
+    A leading `=` marks a term as case-sensitive, for acronyms that are also
+    ordinary words ("=WHO" should not fire on "who").
+    """
+    terms, exact = {}, set()
+    for term in raw_terms:
+        if term.startswith("="):
+            term = term[1:].strip()
+            exact.add(term.lower())
+        if term:
+            terms.setdefault(term.lower(), term)
+    return terms, frozenset(exact & terms.keys())
+
+def match_terms(automaton, terms, text, exact=frozenset()):
+    """Display forms of the terms in `text`, whole words only, in order of appearance"""
+    original, text = text, text.lower()
+    # Lowercasing can change the length of some characters, shifting offsets
+    aligned = len(original) == len(text)
+    found = []
+    for start, term in automaton.search(text):
+        end = start + len(term)
+        # Whole words only, so "AI" does not fire inside "said"
+        if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+            if term in exact and aligned and original[start:end] != terms[term]:
+                continue
+            if terms[term] not in found:
+                found.append(terms[term])
+    return tuple(found)
+
+def watch_alert(term, article):
+    return {
+        "term": term,
+        "title": article["title"],
+        "link": article["link"],
+        "source": article["source"],
+        "published_ts": article["published_ts"],
+    }
+
+def watch_alerts(watchlist, articles):
+    """An alert per article and term among `articles`, for this session only"""
+    alerts, seen = [], set()
+    for article in articles:
+        key = article_key(article)
+        if key in seen:
+            continue
+        seen.add(key)
+        alerts.extend(watch_alert(term, article) for term in watchlist.matched(article))
+    return alerts
+
+class Watchlist:
+    """Shared watched terms, per-article matches and recent alerts
+
+    Matching is case-insensitive on whole words unless a term opts out.
+    Editing the file compiles a new automaton and bumps the version, after
+    which articles are rescanned the next time they come through. Only
+    scan() raises shared alerts, once per article and term; it is fed the
+    built-in feeds alone, so no visitor can post to everyone's sidebar.
+    """
+
+    def __init__(self, path, symbols=()):
+        self.path = path
+        self.symbols = list(symbols)
+        self.lock = threading.Lock()
+        self.file_mtime = None
+        self.version = 0
+        self.matches = OrderedDict()    # article key -> matched terms, for this version
+        self.alerts = deque(maxlen=WATCHLIST_ALERTS)
+        self.alerted = OrderedDict()    # (article key, term) already alerted
+        self.hits = defaultdict(int)
+        self._sync(force=True)
+
+    def _sync(self, force=False):
+        """Recompile if forced or the watchlist file changed"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if not force and mtime == self.file_mtime:
+            return
+        self.file_mtime = mtime
+        self.terms, self.exact = compile_terms(read_watchlist(self.path) + self.symbols)
+        self.automaton = AhoCorasick(self.terms)
+        self.version += 1
+        self.matches.clear()
+
+    def _matched(self, article):
+        key = article_key(article)
+        found = self.matches.get(key)
+        if found is None:
+            found = self.matches[key] = match_terms(
+                self.automaton, self.terms, f"{article['title']}\n{article['summary']}", self.exact
+            )
+            if len(self.matches) > WATCHLIST_MEMO:
+                self.matches.popitem(last=False)
+        return key, found
+
+    def scan(self, articles):
+        """Match articles against the current watchlist and raise shared alerts"""
+        with self.lock:
+            self._sync()
+            for article in articles:
+                key, found = self._matched(article)
+                for term in found:
+                    if (key, term) in self.alerted:
+                        continue
+                    self.alerted[(key, term)] = True
+                    if len(self.alerted) > WATCHLIST_MEMO:
+                        self.alerted.popitem(last=False)
+                    self.hits[term] += 1
+                    self.alerts.appendleft(watch_alert(term, article))
+
+    def matched(self, article):
+        """Watched terms mentioned by an article, without raising alerts"""
+        with self.lock:
+            self._sync()
+            return self._matched(article)[1]
+
+def highlight_card(card_html, terms):
+    """Mark a pre-rendered news card as matching watched terms"""
+    chips = "".join(f'<span class="watch-chip">🚨 {html.escape(term)}</span>' for term in terms)
+    return card_html.replace('<div class="news-card">', '<div class="news-card news-watch">', 1).replace(
+        '<div class="news-source">', f'{chips}<div class="news-source">', 1
+    )
+
+class SessionWatchlist:
+    """One visitor's own watched terms, matched as their cards are rendered"""
+
+    def __init__(self, terms):
+        self.terms, self.exact = compile_terms(terms)
+        self.automaton = AhoCorasick(self.terms)
+        self.matches = OrderedDict()    # article key -> matched terms
+
+    def matched(self, article):
+        key = article_key(article)
+        found = self.matches.get(key)
+        if found is None:
+            found = self.matches[key] = match_terms(
+                self.automaton, self.terms, f"{article['title']}\n{article['summary']}", self.exact
+            )
+            if len(self.matches) > WATCHLIST_SESSION_MEMO:
+                self.matches.popitem(last=False)
+        return found
+
+@st.cache_resource
+def get_watchlist():
+    """Shared watchlist for every session in this process"""
+    return Watchlist(WATCHLIST_PATH, MARKET_TICKERS)
+
+def get_session_watchlist():
+    """This session's sidebar terms, compiled; None if it has none"""
+    terms = tuple(st.session_state.get("nexus_watch_terms", ()))
+    if not terms:
+        return None
+    compiled = st.session_state.get("nexus_watch_compiled")
+    if compiled is None or compiled[0] != terms:
+        compiled = st.session_state["nexus_watch_compiled"] = (terms, SessionWatchlist(terms))
+    return compiled[1]
+
+# ============================================================================
+# METRIC HISTORY
+# ============================================================================
+
+METRIC_INTERVAL = 15            # seconds between recorded samples of a metric
+METRIC_RESOLUTIONS = (          # (name, bucket seconds, capacity)
+    ("raw", METRIC_INTERVAL, 240),      # last hour
+    ("1m", 60, 1440),                   # last day
+    ("1h", 3600, 720),                  # last 30 days
+)
+SPARKLINE_POINTS = 30
+
+class RingBuffer:
+    """Fixed-capacity (timestamp, value) ring backed by two float arrays"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.size = 0
+
+    def append(self, ts, value):
+        self.times[self.head] = ts
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def last(self, n):
+        """Oldest-first list of the newest `n` values"""
+        n = min(n, self.size)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.values[start:start + n].tolist()
+        return self.values[start:].tolist() + self.values[:self.head].tolist()
+
+class MetricSeries:
+    """Raw samples plus mean rollups at coarser resolutions"""
+
+    def __init__(self):
+        self.rings = {name: RingBuffer(capacity) for name, _, capacity in METRIC_RESOLUTIONS}
+        self.buckets = {name: None for name, _, _ in METRIC_RESOLUTIONS[1:]}    # [start, sum, count]
+        self.last_ts = None
+        self.last_value = None
+        self.trend = {"delta": 0.0, "spark": ""}
+
+    def record(self, ts, value):
+        self.rings["raw"].append(ts, value)
+        for name, seconds, _ in METRIC_RESOLUTIONS[1:]:
+            start = ts - ts % seconds
+            bucket = self.buckets[name]
+            if bucket and bucket[0] != start:
+                self.rings[name].append(bucket[0], bucket[1] / bucket[2])
+                bucket = None
+            if bucket is None:
+                bucket = self.buckets[name] = [start, 0.0, 0]
+            bucket[1] += value
+            bucket[2] += 1
+        self.last_ts, self.last_value = ts, value
+        self.trend = self._trend()
+
+    def _trend(self):
+        # Prefer minute rollups once there are enough; fall back to raw samples early on
+        minutes = self.rings["1m"]
+        if minutes.size >= 2:
+            values = minutes.last(SPARKLINE_POINTS - 1) + [self.last_value]
+        else:
+            values = self.rings["raw"].last(SPARKLINE_POINTS)
+        return {"delta": values[-1] - values[0], "spark": sparkline_points(values)}
+
+def sparkline_points(values, width=100, height=24):
+    """SVG polyline points for values scaled into a width x height box"""
+    if len(values) < 2:
+        return ""
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1.0
+    step = width / (len(values) - 1)
+    return " ".join(f"{i * step:.1f},{height - (v - lo) / span * height:.1f}" for i, v in enumerate(values))
+
+class MetricHistory:
+    """Process-wide metric store; each metric is produced at most once per interval"""
+
+    def __init__(self, interval=METRIC_INTERVAL):
+        self.interval = interval
+        self.series = defaultdict(MetricSeries)
+        self.latest = {}            # group -> (sampled_at, values)
+        self.lock = threading.Lock()
+
+    def sample(self, name, producer):
+        """Latest value of a scalar metric, calling `producer` only when it is due"""
+        return self.sample_group(name, lambda: {"value": producer()})["value"]
+
+    def sample_group(self, prefix, producer):
+        """Latest values of a dict-producing metric group, recorded per key"""
+        now = time.time()
+        with self.lock:
+            sampled_at, values = self.latest.get(prefix, (None, None))
+            if sampled_at is None or now - sampled_at >= self.interval:
+                values = producer()
+                for key, value in values.items():
+                    self.series[f"{prefix}.{key}"].record(now, float(value))
+                self.latest[prefix] = (now, values)
+            return values
+
+    def trend(self, name):
+        """Precomputed {delta, spark} for a metric, updated when it was recorded"""
+        series = self.series.get(name)
+        return series.trend if series else {"delta": 0.0, "spark": ""}
+
+@st.cache_resource
+def get_metric_history():
+    """Shared metric history for every session in this process"""
+    return MetricHistory()
+
+# ============================================================================
+# COMPONENT RENDERERS
+# ============================================================================
+
+def _shift_news_page(key, step):
+    st.session_state[key] = max(0, st.session_state.get(key, 0) + step)
+
+def _add_custom_feed():
+    url = st.session_state.get("nexus_feed_url", "").strip()
+    if safe_link(url) == "#" or not urlsplit(url).netloc:
+        st.session_state["nexus_feed_error"] = "Feed URLs must start with http:// or https://"
+        return
+    if not is_public_url(url):
+        st.session_state["nexus_feed_error"] = "Feed URLs must point at a public host"
+        return
+    st.session_state.pop("nexus_feed_error", None)
+    custom = st.session_state.setdefault("nexus_custom_feeds", [])
+    if url not in custom:
+        custom.append(url)
+    subscriptions = st.session_state.setdefault("nexus_subscriptions", [])
+    if url not in subscriptions:
+        subscriptions.append(url)
+    st.session_state["nexus_feed_url"] = ""
+
+def _add_watch_term():
+    term = " ".join(st.session_state.get("nexus_watch_term", "").split())
+    st.session_state["nexus_watch_term"] = ""
+    terms = list(st.session_state.get("nexus_watch_terms", []))
+    if not term or term.lower() in get_watchlist().terms or term.lower() in (t.lower() for t in terms):
+        return
+    if len(terms) >= WATCHLIST_SESSION_TERMS:
+        st.session_state["nexus_watch_error"] = f"Up to {WATCHLIST_SESSION_TERMS} terms of your own; remove one first"
+        return
+    st.session_state.pop("nexus_watch_error", None)
+    st.session_state["nexus_watch_terms"] = terms + [term]
+
+def render_watch_alerts(alerts, theme, limit=8):
+    """Render the most recent watchlist alerts, newest story first"""
+    alerts = sorted(alerts, key=lambda alert: alert["published_ts"], reverse=True)[:limit]
+    if not alerts:
+        st.caption("No watched terms in the news yet.")
+        return
+    rows = "".join(
+        f'<div style="margin-bottom: 8px;"><span class="watch-chip">{html.escape(alert["term"])}</span>'
+        f'<a href="{html.escape(alert["link"], quote=True)}" target="_blank" rel="noopener noreferrer" '
+        f'style="color: {theme["text_secondary"]};">{html.escape(alert["title"])}</a></div>'
+        for alert in alerts
+    )
+    st.markdown(f'<div style="font-size: 0.8rem;">{rows}</div>', unsafe_allow_html=True)
+
+def render_news_feed(articles, feed_key, theme):
+    """Render one page of news cards with pager controls
+
+    Only the visible page is joined into a single markdown element, so rerun
+    cost stays flat however many articles the category window holds.
+    """
+    if not articles:
+        st.info("No articles available right now.")
+        return
+    
+    page_key = f"news_page_{feed_key}"
+    pages = (len(articles) + NEWS_PAGE_SIZE - 1) // NEWS_PAGE_SIZE
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+    st.session_state[page_key] = page
+    start = page * NEWS_PAGE_SIZE
+    
+    thumbs = get_thumbnail_cache()
+    watchlist, session_watchlist = get_watchlist(), get_session_watchlist()
+    cards = []
+    for article in articles[start:start + NEWS_PAGE_SIZE]:
+        if thumbs and "thumb_key" in article and thumbs.ensure(article["image_url"], article["thumb_key"]):
+            card = article["card_html_thumb"]
+        else:
+            card = article["card_html"]
+        terms = watchlist.matched(article)
+        if session_watchlist:
+            terms += tuple(term for term in session_watchlist.matched(article) if term not in terms)
+        cards.append(highlight_card(card, terms) if terms else card)
+    st.markdown("".join(cards), unsafe_allow_html=True)
+    
+    if pages > 1:
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("← Newer", key=f"{page_key}_prev", disabled=page == 0,
+                      on_click=_shift_news_page, args=(page_key, -1), use_container_width=True)
+        with col_info:
+            st.markdown(
+                f'<div style="text-align: center; color: {theme["text_muted"]}; padding-top: 8px;">'
+                f'Page {page + 1} of {pages} • {len(articles)} articles</div>',
+                unsafe_allow_html=True,
+            )
+        with col_next:
+            st.button("Older →", key=f"{page_key}_next", disabled=page >= pages - 1,
+                      on_click=_shift_news_page, args=(page_key, 1), use_container_width=True)
+
+def render_weather_card(weather, theme):
+    """Render weather widget"""
+    st.markdown(f"""
+    <div class="metric-card">
+        <div class="metric-label">CURRENT CONDITIONS</div>
+        <div style="font-size: 5rem; margin: 20px 0;">{weather['icon']}</div>
+        <div class="metric-value">{weather['temp']}°</div>
+        <div class="metric-subtitle">{html.escape(weather['city'])}</div>
+        <div style="color: {theme['text_secondary']}; margin-top: 12px;">
+            {weather['condition']}
+        </div>
+        <div class="metric-footer">
+            <div style="display: flex; justify-content: space-around;">
+                <div>💨 {weather['speed']} km/h</div>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_forecast_chart(weather, lat, lon, theme_name):
+    """Render the downsampled hourly forecast under the weather card"""
+    if not weather["hourly"].get("time"):
+        return
+    fig = build_forecast_figure(lat, lon, weather["fetched_at"], theme_name, weather["hourly"])
+    if fig:
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+def render_market_card(name, data, theme):
+    """Render market ticker card with chart"""
+    color = theme['success'] if data['change'] >= 0 else theme['danger']
+    arrow = "↗" if data['change'] >= 0 else "↘"
+    
+    # Create sparkline
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        y=data['history'],
+        mode='lines',
+        line=dict(color=color, width=2.5),
+        fill='tozeroy',
+        fillcolor='rgba(74, 222, 128, 0.1)' if data['change'] >= 0 else 'rgba(248, 113, 113, 0.1)',
+        hovertemplate='$%{y:,.2f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=70,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        showlegend=False
+    )
+    
+    st.markdown(f"""
+    <div class="market-card">
+        <div class="market-header">
+            <span class="market-name">{name}</span>
+            <span class="badge" style="color: {color}; border-color: {color};">
                 {arrow} {abs(data['change']):.2f}%
             </span>
         </div>
@@ -872,8 +3496,24 @@ def render_market_card(name, data, theme):
     </div>
     """, unsafe_allow_html=True)
 
-def render_sentiment_meter(score, theme):
+def render_sparkline(trend, color):
+    """Inline SVG sparkline from a precomputed metric trend"""
+    if not trend["spark"]:
+        return ""
+    return f"""<svg class="sparkline" viewBox="0 0 100 24" preserveAspectRatio="none">
+        <polyline points="{trend['spark']}" fill="none" stroke="{color}" stroke-width="1.5" vector-effect="non-scaling-stroke"/>
+    </svg>"""
+
+def render_delta(trend, theme, digits=2):
+    delta = round(trend["delta"], digits)
+    if not delta:
+        return f'<span class="stat-delta" style="color: {theme["text_muted"]};">± 0</span>'
+    color = theme['success'] if delta > 0 else theme['danger']
+    return f'<span class="stat-delta" style="color: {color};">{"▲" if delta > 0 else "▼"} {abs(delta):g}</span>'
+
+def render_sentiment_meter(score, theme, trend=None):
     """Render global sentiment meter"""
+    trend = trend or {"delta": 0.0, "spark": ""}
     # Convert -1 to 1 scale to 0-100
     percentage = (score + 1) / 2 * 100
     
@@ -895,34 +3535,253 @@ def render_sentiment_meter(score, theme):
             </div>
         </div>
         <div class="metric-footer">
-            Score: {score:.2f} / 1.00
+            Score: {score:.2f} / 1.00 {render_delta(trend, theme)}
+            {render_sparkline(trend, color)}
         </div>
     </div>
     """, unsafe_allow_html=True)
 
-def render_world_stats(stats, theme):
+def render_world_stats(stats, theme, trends=None):
     """Render world statistics grid"""
+    trends = trends or {}
+    flat = {"delta": 0.0, "spark": ""}
+    
+    def extras(key, color):
+        trend = trends.get(key, flat)
+        return f"{render_delta(trend, theme)}{render_sparkline(trend, color)}"
+    
     st.markdown(f"""
     <div class="stats-grid">
         <div class="stat-item">
             <div class="stat-value" style="color: {theme['danger']};">⚔️ {stats['active_conflicts']}</div>
             <div class="stat-label">Active Conflicts</div>
+            {extras('active_conflicts', theme['danger'])}
         </div>
         <div class="stat-item">
             <div class="stat-value" style="color: {theme['warning']};">🌡️ +{stats['global_temp_anomaly']}°C</div>
             <div class="stat-label">Temp Anomaly</div>
+            {extras('global_temp_anomaly', theme['warning'])}
         </div>
         <div class="stat-item">
             <div class="stat-value" style="color: {theme['success']};">🌐 {stats['internet_users']}B</div>
             <div class="stat-label">Internet Users</div>
+            {extras('internet_users', theme['success'])}
         </div>
         <div class="stat-item">
             <div class="stat-value" style="color: {theme['warning']};">💨 {stats['co2_ppm']} ppm</div>
             <div class="stat-label">CO₂ Levels</div>
+            {extras('co2_ppm', theme['warning'])}
         </div>
     </div>
     """, unsafe_allow_html=True)
 
+def render_trending_panel(trending, theme):
+    """Render rising terms per news category"""
+    rows = []
+    for category, terms in trending.items():
+        if terms:
+            chips = "".join(
+                f'<span class="trend-chip{" trend-rising" if rising > TREND_RISING else ""}">'
+                f'{html.escape(term)}{" ↑" if rising > TREND_RISING else ""}</span>'
+                for term, _, rising in terms
+            )
+        else:
+            chips = f'<span style="color: {theme["text_muted"]};">Collecting signal...</span>'
+        rows.append(f"""
+        <div class="trend-row">
+            <span class="trend-category">{category.upper()}</span>
+            {chips}
+        </div>""")
+    
+    st.markdown(f"""
+    <div class="metric-card" style="text-align: left;">
+        <div class="metric-label">🔥 TRENDING NOW</div>
+        {"".join(rows)}
+    </div>
+    """, unsafe_allow_html=True)
+
+# ============================================================================
+# HEADLESS JSON API
+# ============================================================================
+# `python streamlit-app.py api` serves the dashboard's aggregates as JSON from
+# the same refresh graph and payload cache, without a Streamlit session.
+
+API_PORT = 8502
+API_MAX_AGE = 15                # seconds a client may reuse a response unchecked
+API_BODY_CACHE_ENTRIES = 1024
+API_GZIP_MIN_BYTES = 1024
+API_NEWS_LIMIT = 50
+API_ARTICLE_FIELDS = ("title", "link", "published", "published_ts", "source", "summary", "image_url")
+
+def _api_news(params):
+    category = params.get("category", "world")
+    if category == "local":
+        region = params.get("region", "").upper()
+        if region not in REGIONAL_FEEDS:
+            raise ValueError(f"no regional feeds for region '{region}'")
+        return ("news.local", (region,)), "items", API_ARTICLE_FIELDS, None
+    if category not in NEWS_CATEGORIES:
+        raise ValueError(f"unknown category '{category}'")
+    return f"news.{category}", "items", API_ARTICLE_FIELDS, None
+
+def _api_weather(params):
+    try:
+        lat, lon = float(params["lat"]), float(params["lon"])
+    except (KeyError, ValueError):
+        raise ValueError("lat and lon are required numbers")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("lat/lon out of range")
+    # Snapped like the dashboard's, so both share weather nodes; a city name
+    # only labels the response, as the dashboard's does
+    resolved = resolve_location(lat, lon)
+    city = params.get("city", "").strip()[:80] or resolved["city"]
+    return ("weather", (resolved["lat"], resolved["lon"])), "object", None, {"city": city}
+
+def _api_markets(params):
+    return "markets", "values", None, None
+
+# path -> params -> (graph item, payload shape, default fields, display fields or None)
+API_ENDPOINTS = {
+    "/api/news": _api_news,
+    "/api/weather": _api_weather,
+    "/api/markets": _api_markets,
+}
+
+def select_fields(payload, shape, fields):
+    """Keep only `fields` of each item, each value, or the object itself"""
+    if not fields:
+        return payload
+    pick = lambda record: {field: record[field] for field in fields if field in record}
+    if shape == "items":
+        return [pick(record) for record in payload]
+    if shape == "values":
+        return {name: pick(record) for name, record in payload.items()}
+    return pick(payload)
+
+def _api_json_default(value):
+    """JSON form of the typed arrays kept in node values (NaN gaps become null)"""
+    if isinstance(value, array):
+        if value.typecode in "fd":
+            return [None if math.isnan(v) else round(v, 4) for v in value]
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class JsonApi:
+    """Threaded HTTP server for the JSON endpoints
+
+    Responses are cached fully serialized, plain and gzipped, per endpoint,
+    graph node and field selection. A cached body is reused for as long as
+    its node is fresh and still at the version the body was built from, so a
+    hit never decompresses a payload or encodes JSON.
+    """
+
+    def __init__(self, host, port):
+        self.graph = get_refresh_graph()
+        self.bodies = OrderedDict()     # request key -> (node version, etag, body, gzipped)
+        self.lock = threading.Lock()
+        self.stats = defaultdict(int)
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    def _error(self, status, message):
+        return status, None, json.dumps({"error": message}).encode(), None
+
+    def respond(self, path, query):
+        """(status, etag, body, gzipped body or None) for a GET"""
+        endpoint = API_ENDPOINTS.get(path)
+        if endpoint is None:
+            return self._error(404, f"no endpoint {path}; try {', '.join(API_ENDPOINTS)}")
+        params = dict(parse_qsl(query))
+        try:
+            item, shape, fields, display = endpoint(params)
+            if params.get("fields"):
+                fields = tuple(field.strip() for field in params["fields"].split(",") if field.strip())
+            limit = min(int(params.get("limit", API_NEWS_LIMIT)), ARTICLE_WINDOW)
+            if limit < 0:
+                raise ValueError("limit must be 0 or more")
+        except ValueError as e:
+            return self._error(400, str(e))
+        
+        display = tuple(sorted(display.items())) if display else ()
+        request_key = (path, item, fields, limit if shape == "items" else None, display)
+        version = self.graph.version(item)
+        with self.lock:
+            cached = self.bodies.get(request_key)
+            if cached and version is not None and cached[0] == version:
+                self.bodies.move_to_end(request_key)
+                self.stats["hits"] += 1
+                return (200,) + cached[1:]
+        
+        value = self.graph.refresh([item])[item]
+        if display:
+            value = dict(value, **dict(display))
+        payload = select_fields(value, shape, fields)
+        if shape == "items":
+            payload = payload[:limit]
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=_api_json_default).encode()
+        etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= API_GZIP_MIN_BYTES else None
+        with self.lock:
+            self.bodies[request_key] = (self.graph.version(item), etag, body, gzipped)
+            self.bodies.move_to_end(request_key)
+            if len(self.bodies) > API_BODY_CACHE_ENTRIES:
+                self.bodies.popitem(last=False)
+            self.stats["misses"] += 1
+        return 200, etag, body, gzipped
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, so clients reuse connections
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                try:
+                    status, etag, body, gzipped = api.respond(parts.path.rstrip("/"), parts.query)
+                except Exception as e:
+                    print(f"[nexus] API {parts.path} failed: {e!r}", file=sys.stderr)
+                    api.stats["errors"] += 1
+                    status, etag, body, gzipped = api._error(500, "internal error")
+                if etag and etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+                    api.stats["not_modified"] += 1
+                    status, body, gzipped = 304, b"", None
+                elif gzipped and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzipped
+                else:
+                    gzipped = None
+                
+                self.send_response(status)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", f"public, max-age={API_MAX_AGE}")
+                else:
+                    self.send_header("Cache-Control", "no-store")
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def serve(self):
+        host, port = self.server.server_address[:2]
+        print(f"[nexus] JSON API on http://{host}:{port} ({', '.join(API_ENDPOINTS)})", file=sys.stderr)
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
@@ -958,12 +3817,52 @@ def main():
         location = st.selectbox("Select Location", list(location_presets.keys()), label_visibility="visible")
         
         if location == "Custom":
-            city_name = st.text_input("City Name", "Metropolis")
             custom_lat = st.number_input("Latitude", value=40.71, format="%.2f")
             custom_lon = st.number_input("Longitude", value=-74.00, format="%.2f")
+            resolved = resolve_location(custom_lat, custom_lon)
+            city_name = st.text_input("City Name (optional)", "", placeholder=resolved["city"]) or resolved["city"]
+            st.caption(
+                f"📍 Nearest: {resolved['city']}, {resolved['country']} "
+                f"({resolved['distance_km']:.0f} km) • geohash {resolved['geohash']}"
+            )
         else:
             city_name = location
             custom_lat, custom_lon = location_presets[location]
+            resolved = resolve_location(custom_lat, custom_lon)
+        
+        st.markdown("---")
+        
+        # Personal feed mix, kept per session
+        st.markdown("**📡 My Feeds**")
+        catalog = feed_catalog()
+        custom_feeds = st.session_state.get("nexus_custom_feeds", [])
+        subscriptions = st.multiselect(
+            "Subscribed feeds",
+            list(catalog) + [url for url in custom_feeds if url not in catalog],
+            format_func=lambda url: catalog.get(url, url),
+            key="nexus_subscriptions",
+            placeholder="Pick feeds for the MY FEEDS tab",
+            label_visibility="collapsed",
+        )
+        st.text_input("Add feed URL", key="nexus_feed_url", placeholder="https://example.com/rss.xml",
+                      on_change=_add_custom_feed, label_visibility="collapsed")
+        if "nexus_feed_error" in st.session_state:
+            st.caption(f"⚠️ {st.session_state['nexus_feed_error']}")
+        
+        st.markdown("---")
+        
+        # Shared terms plus this session's own; alerts are filled in once this
+        # rerun's feeds are scanned
+        st.markdown("**🚨 Watchlist**")
+        st.text_input("Watch a term", key="nexus_watch_term", placeholder="Add a company, country or ticker",
+                      on_change=_add_watch_term, label_visibility="collapsed")
+        if st.session_state.get("nexus_watch_terms"):
+            # Deselecting a term removes it
+            st.multiselect("My watched terms", options=list(st.session_state["nexus_watch_terms"]),
+                           key="nexus_watch_terms", label_visibility="collapsed")
+        if "nexus_watch_error" in st.session_state:
+            st.caption(f"⚠️ {st.session_state['nexus_watch_error']}")
+        alerts_slot = st.empty()
         
         st.markdown("---")
         
@@ -972,6 +3871,8 @@ def main():
         auto_refresh = st.checkbox("Auto-refresh (5 min)", value=False)
         if st.button("🔄 Refresh Now", use_container_width=True):
             st.cache_data.clear()
+            get_payload_cache().clear()
+            get_refresh_graph().invalidate()
             st.rerun()
         
         st.markdown("---")
@@ -983,9 +3884,31 @@ def main():
         <div style="margin-top: 16px; font-size: 0.8rem; opacity: 0.7;">
             Last Update: {datetime.now().strftime('%H:%M:%S')}<br>
             Uptime: 99.9%<br>
-            Data Sources: 12 Active
+            Data Sources: {len(DATA_SOURCES)} registered ({get_refresh_graph().stats['skipped']} recomputes skipped)<br>
+            Upstream Throttled: {get_rate_governor().stats['throttled']} (served stale: {get_rate_governor().stats['served_stale']})
+        </div>
+        """, unsafe_allow_html=True)
+        cache = get_payload_cache().summary()
+        st.markdown(f"""
+        <div style="font-size: 0.8rem; opacity: 0.7;">
+            Cache ({cache['codec']}): {cache['bytes'] / 2**20:.1f} MB of {PAYLOAD_CACHE_BYTES / 2**20:.0f} MB
+            (×{cache['ratio']:.1f}) • {cache['hit_rate']:.0%} hits • {cache['evictions']} evicted
         </div>
         """, unsafe_allow_html=True)
+        subscriber = get_websub_subscriber()
+        if subscriber:
+            st.markdown(f"""
+            <div style="font-size: 0.8rem; opacity: 0.7;">
+                Push Feeds: {subscriber.live_count()} live • {subscriber.stats['pushes']} updates
+            </div>
+            """, unsafe_allow_html=True)
+        
+        if OPERATOR_MODE:
+            st.markdown("---")
+            st.markdown("**🛠️ Operator Tools**")
+            if st.button("🔬 Profile this rerun", use_container_width=True):
+                st.session_state["nexus_profile_next"] = True
+                st.rerun()
 
     # Apply Selected Theme
     inject_premium_css(selected_theme)
@@ -999,17 +3922,37 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    # ========== DATA REFRESH ==========
+    # Snapped coordinates alone key the weather node, so nearby custom locations
+    # share it whatever name was typed; the display name is applied at render
+    weather_key = ("weather", (resolved["lat"], resolved["lon"]))
+    local_key = ("news.local", (resolved["country_code"],))
+    # Followed feeds resolve to shared per-URL nodes; merging them is this session's only cost
+    subscription_keys = [("feed", (url,)) for url in subscriptions]
+    wanted = [f"news.{category}" for category in NEWS_CATEGORIES] + ["sentiment", "markets", weather_key]
+    wanted += subscription_keys
+    if resolved["country_code"] in REGIONAL_FEEDS:
+        wanted.append(local_key)
+    with st.spinner("Refreshing data sources..."):
+        data = get_refresh_graph().refresh(
+            wanted, {weather_key: PRIORITY_LOW if location == "Custom" else PRIORITY_HIGH}
+        )
+
     # ========== TOP METRICS ROW ==========
-    sentiment_score = calculate_sentiment_score()
-    world_stats = generate_world_stats()
+    # Sampled at most once per METRIC_INTERVAL across all sessions
+    history = get_metric_history()
+    sentiment_score = history.sample("sentiment", lambda: data["sentiment"])
+    world_stats = history.sample_group("world", generate_world_stats)
     
     col_sent, col_stats = st.columns([1, 2])
     
     with col_sent:
-        render_sentiment_meter(sentiment_score, theme)
+        render_sentiment_meter(sentiment_score, theme, history.trend("sentiment.value"))
     
     with col_stats:
-        render_world_stats(world_stats, theme)
+        render_world_stats(world_stats, theme, {key: history.trend(f"world.{key}") for key in world_stats})
+        # Filled once the news tabs below have fed the trend trackers
+        trending_slot = st.empty()
 
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
 
@@ -1020,46 +3963,62 @@ def main():
     with col_news:
         st.markdown('<div class="section-header">📰 GLOBAL INTELLIGENCE FEED</div>', unsafe_allow_html=True)
         
-        tab1, tab2, tab3, tab4 = st.tabs(["🌍 WORLD", "💻 TECH", "🧬 SCIENCE", "💼 BUSINESS"])
-        
-        with tab1:
-            with st.spinner("Loading world news..."):
-                news = fetch_news("world")
-                for article in news:
-                    render_news_card(article, theme)
-        
-        with tab2:
-            with st.spinner("Loading tech news..."):
-                news = fetch_news("tech")
-                for article in news:
-                    render_news_card(article, theme)
-        
-        with tab3:
-            with st.spinner("Loading science news..."):
-                news = fetch_news("science")
-                for article in news:
-                    render_news_card(article, theme)
+        tabs = st.tabs(
+            [spec["label"] for spec in NEWS_CATEGORIES.values()]
+            + [f"📍 {resolved['country_code']}", "⭐ MY FEEDS"]
+        )
         
-        with tab4:
-            with st.spinner("Loading business news..."):
-                news = fetch_news("business")
-                for article in news:
-                    render_news_card(article, theme)
+        for tab, category in zip(tabs, NEWS_CATEGORIES):
+            with tab:
+                render_news_feed(data[f"news.{category}"], category, theme)
+        
+        with tabs[-2]:
+            if resolved["country_code"] in REGIONAL_FEEDS:
+                render_news_feed(data[local_key], "local", theme)
+            else:
+                st.info(f"No regional feeds configured for {resolved['country']} yet.")
+        
+        with tabs[-1]:
+            if subscriptions:
+                render_news_feed(merge_feeds([data[key] or [] for key in subscription_keys]), "mine", theme)
+            else:
+                st.info("Pick feeds under 📡 My Feeds in the sidebar to build your own mix.")
+
+    watchlist, session_watchlist = get_watchlist(), get_session_watchlist()
+    alerts, watched, alert_count = list(watchlist.alerts), len(watchlist.terms), sum(watchlist.hits.values())
+    # Shared terms in this session's pasted feeds alert here, never process-wide
+    pasted = [data[key] or [] for key in subscription_keys if key[1][0] not in catalog]
+    own = watch_alerts(watchlist, itertools.chain.from_iterable(pasted))
+    if session_watchlist:
+        shown = [data[f"news.{category}"] for category in NEWS_CATEGORIES] + [data[key] for key in subscription_keys]
+        if resolved["country_code"] in REGIONAL_FEEDS:
+            shown.append(data[local_key])
+        own += watch_alerts(session_watchlist, itertools.chain.from_iterable(articles or [] for articles in shown))
+        watched += len(session_watchlist.terms)
+    alerts, alert_count = alerts + own, alert_count + len(own)
+    with alerts_slot.container():
+        st.caption(f"{watched} terms watched • {alert_count} alerts")
+        render_watch_alerts(alerts, theme)
+
+    trending = get_trending_topics()
+    with trending_slot.container():
+        render_trending_panel(
+            {category: trending.top(category) for category in NEWS_CATEGORIES},
+            theme,
+        )
 
     # SIDE PANEL
     with col_side:
         # Weather
         st.markdown('<div class="section-header">🌡️ CONDITIONS</div>', unsafe_allow_html=True)
-        with st.spinner("Loading weather..."):
-            weather = fetch_weather(custom_lat, custom_lon, city_name)
-            render_weather_card(weather, theme)
+        weather = dict(data[weather_key], city=city_name)
+        render_weather_card(weather, theme)
+        render_forecast_chart(weather, resolved["lat"], resolved["lon"], selected_theme)
         
         # Markets
         st.markdown('<div class="section-header" style="margin-top: 32px;">📈 MARKET PULSE</div>', unsafe_allow_html=True)
-        with st.spinner("Loading market data..."):
-            market_data = generate_market_data()
-            for ticker, data in market_data.items():
-                render_market_card(ticker, data, theme)
+        for ticker, quote in data["markets"].items():
+            render_market_card(ticker, quote, theme)
 
     # ========== FOOTER ==========
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
@@ -1085,5 +4044,38 @@ def main():
         time.sleep(300)  # 5 minutes
         st.rerun()
 
-if __name__ == "__main__":
-    main()
+def run_cli(argv):
+    """Command-line entry points: `python streamlit-app.py <command> ...`"""
+    parser = argparse.ArgumentParser(prog="streamlit-app.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest-market", help="append OHLCV bars from CSV files to the market store")
+    ingest.add_argument("csv", nargs="+")
+    ingest.add_argument("--symbol", help="symbol for files without a symbol column")
+    ingest.add_argument("--data-dir", default=MARKET_DATA_DIR)
+    api = commands.add_parser("api", help="serve news, weather and market data as JSON")
+    api.add_argument("--host", default="127.0.0.1")
+    api.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+    
+    if args.command == "ingest-market":
+        for path in args.csv:
+            try:
+                added = ingest_market_csv(path, args.data_dir, args.symbol)
+            except ValueError as e:
+                parser.error(str(e))
+            for symbol, rows in added.items():
+                print(f"{path}: {symbol} +{rows:,} bars")
+    elif args.command == "api":
+        # Without a Streamlit session every cache call from a worker thread warns
+        lazy_import("streamlit.logger").set_log_level("error")
+        JsonApi(args.host, args.port).serve()
+
+if __name__ == "__main__" and len(sys.argv) > 1 and not st.runtime.exists():
+    run_cli(sys.argv[1:])
+elif __name__ == "__main__":
+    if OPERATOR_MODE and st.session_state.pop("nexus_profile_next", False):
+        profile_run(main)
+    else:
+        main()
+    if STARTUP_PROFILE:
+        report_startup(time.perf_counter() - _script_started)
@@ -0,0 +1,56 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit-app.py")
+
+
+@pytest.fixture(scope="module")
+def app():
+    spec = importlib.util.spec_from_file_location("nexus_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_bars(path, closes, start=1_700_000_000, bad_at=None):
+    lines = ["symbol,timestamp,close"]
+    for i, close in enumerate(closes):
+        lines.append(f"TEST,{start + 60 * i},{'' if i == bad_at else close}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_failed_ingest_leaves_no_rows_behind(app, tmp_path):
+    data_dir = str(tmp_path / "market")
+    bad = tmp_path / "bad.csv"
+    write_bars(bad, [100.0 + i for i in range(15)], bad_at=12)
+    with pytest.raises(ValueError):
+        app.ingest_market_csv(str(bad), data_dir, chunk_rows=10)
+    close_path = os.path.join(data_dir, "TEST", "close.bin")
+    assert not os.path.exists(close_path) or os.path.getsize(close_path) == 0
+
+    good = tmp_path / "good.csv"
+    write_bars(good, [500.0 + i for i in range(10)], start=1_800_000_000)
+    assert app.ingest_market_csv(str(good), data_dir, chunk_rows=4) == {"TEST": 10}
+    with open(os.path.join(data_dir, "manifest.json")) as f:
+        assert json.load(f)["symbols"]["TEST"]["rows"] == 10
+    assert os.path.getsize(close_path) == 10 * 8
+
+
+def test_orphan_rows_past_the_manifest_are_dropped(app, tmp_path):
+    data_dir = str(tmp_path / "market")
+    first = tmp_path / "first.csv"
+    write_bars(first, [100.0, 101.0])
+    app.ingest_market_csv(str(first), data_dir)
+    # An interrupted run that appended without updating the manifest
+    with open(os.path.join(data_dir, "TEST", "close.bin"), "ab") as f:
+        f.write(b"\0" * 8 * 3)
+
+    second = tmp_path / "second.csv"
+    write_bars(second, [509.0], start=1_800_000_000)
+    app.ingest_market_csv(str(second), data_dir)
+    manifest = app._read_manifest(data_dir)
+    store = app.MarketStore(data_dir, manifest)
+    assert list(store._column("TEST", "close")) == [100.0, 101.0, 509.0]